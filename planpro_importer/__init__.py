@@ -1,5 +1,11 @@
-from .planproimporter import import_planpro
+from .planproimporter import import_planpro, validate_planpro
 from .planproversion import PlanProVersion
 from .planpro19 import parse as parse19
 from .planpro110 import parse as parse110
 from .utils import Utils
+from .validator import PlanProValidator, ValidationErrorCode, ValidationReport
+from .sqliteexporter import SQLiteExporter, export_to_sqlite
+from .positioncalculator import Position, PositionCalculator
+from .mergeimporter import MergeReport, TopologyMerger, merge_planpro
+from .valuepool import ValuePool
+from .lazytopology import LazyEdge, LazyTopology
@@ -0,0 +1,366 @@
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from pathlib import Path
+
+from .mergeimporter import merge_planpro
+from .planproimporter import import_planpro, validate_planpro
+from .planproversion import PlanProVersion
+from .sqliteexporter import SQLiteExporter, export_to_sqlite
+from .valuepool import ValuePool
+
+PLANPRO_VERSIONS = {
+    "1.9": PlanProVersion.PlanPro19,
+    "1.10": PlanProVersion.PlanPro110,
+}
+# Seconds a worker waits for the SQLite write lock while another worker exports
+SQLITE_TIMEOUT = 600.0
+
+
+class FingerprintStore:
+
+    def __init__(self, store_file: str):
+        """Persistent store of the content fingerprints of already imported files.
+        Files are only hashed again if their size or modification time changed.
+
+        :param store_file: The JSON file of the store
+        """
+        self.store_file = store_file
+        self.fingerprints: dict[str, dict] = {}
+        self._snapshots: dict[str, dict] = {}
+        if os.path.exists(store_file):
+            with open(store_file, encoding="utf-8") as f:
+                self.fingerprints = json.load(f)
+
+    @staticmethod
+    def get_content_hash(file_name: str) -> str:
+        sha = hashlib.sha256()
+        with open(file_name, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                sha.update(chunk)
+        return sha.hexdigest()
+
+    def has_changed(self, file_name: str) -> bool:
+        """Checks whether the content of a file differs from the stored fingerprint.
+        Updates the stored modification time if only the metadata changed. Files that
+        disappear or are still being written are skipped until the next check.
+
+        :param file_name: The file
+        :return: True, if the file is new or its content changed
+        """
+        try:
+            stat = os.stat(file_name)
+            fingerprint = self.fingerprints.get(file_name)
+            if (
+                fingerprint is not None
+                and fingerprint["size"] == stat.st_size
+                and fingerprint["mtime_ns"] == stat.st_mtime_ns
+            ):
+                return False
+            content_hash = self.get_content_hash(file_name)
+            stat_after_hash = os.stat(file_name)
+        except OSError:
+            return False
+        if (stat.st_size, stat.st_mtime_ns) != (stat_after_hash.st_size, stat_after_hash.st_mtime_ns):
+            # The file changed while hashing it
+            return False
+        snapshot = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": content_hash}
+        if fingerprint is not None and fingerprint["sha256"] == content_hash:
+            self.fingerprints[file_name] = snapshot
+            return False
+        self._snapshots[file_name] = snapshot
+        return True
+
+    def update(self, file_name: str):
+        """Stores the fingerprint that was taken when the change of the file was detected.
+        If the file changed again in the meantime, the next check detects it.
+
+        :param file_name: The file
+        """
+        self.fingerprints[file_name] = self._snapshots.pop(file_name)
+
+    def retain(self, file_names) -> list[str]:
+        """Removes all fingerprints of files that no longer exist.
+
+        :param file_names: The currently existing files
+        :return: The files whose fingerprints were removed
+        """
+        existing = set(file_names)
+        removed = [file_name for file_name in self.fingerprints if file_name not in existing]
+        for file_name in removed:
+            del self.fingerprints[file_name]
+        return removed
+
+    def save(self):
+        tmp_file = f"{self.store_file}.tmp"
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            json.dump(self.fingerprints, f)
+        os.replace(tmp_file, self.store_file)
+
+
+def collect_files(paths) -> list[str]:
+    """Collects all PlanPro files of the given files and directories.
+
+    :param paths: Files and directories
+    :return: The sorted list of PlanPro files
+    """
+    files = set()
+    for path in paths:
+        path = Path(path)
+        if path.is_dir():
+            files.update(str(file) for file in path.rglob("*.ppxml"))
+        else:
+            files.add(str(path))
+    return sorted(files)
+
+
+def get_topology_name(file_name: str, directory: str) -> str:
+    """Gets the name of the topology of a file in a watched directory, which is the
+    path of the file relative to the directory without its extension.
+
+    :param file_name: The PlanPro file
+    :param directory: The watched directory
+    :return: The name of the topology
+    """
+    return Path(file_name).relative_to(directory).with_suffix("").as_posix()
+
+
+def import_file(file_name: str, version: str, sqlite_file: str = None, directory: str = None) -> dict:
+    """Imports a single file and collects its statistics. Errors are part of the result,
+    so a single broken file does not abort a batch.
+
+    :param file_name: The PlanPro file
+    :param version: The PlanPro version string
+    :param sqlite_file: Replace the topology of the file in this SQLite database (optional)
+    :param directory: The watched directory, the topology is named after the path of the file within it (optional)
+    :return: The statistics of the import
+    """
+    stats = {"file": file_name, "ok": False}
+    start = time.perf_counter()
+    topology_name = get_topology_name(file_name, directory) if directory is not None else Path(file_name).stem
+    try:
+        value_pool = ValuePool()
+        topology = import_planpro(file_name, PLANPRO_VERSIONS[version], value_pool=value_pool)
+        topology.name = topology_name
+        stats.update(
+            ok=True,
+            nodes=len(topology.nodes),
+            edges=len(topology.edges),
+            signals=len(topology.signals),
+            routes=len(topology.routes),
+            pooled_bytes_saved=value_pool.memory_report()["total"]["saved_bytes"],
+        )
+        if sqlite_file is not None:
+            # The indexes are created once per watch cycle by the parent process
+            exporter = SQLiteExporter(sqlite_file, timeout=SQLITE_TIMEOUT)
+            try:
+                exporter.export_topology(topology, replace=True)
+            finally:
+                exporter.close(create_indexes=False)
+    except Exception as e:
+        stats["error"] = f"{type(e).__name__}: {e}"
+        if sqlite_file is not None:
+            # Do not keep the rows of the previous version of the file without a marker
+            try:
+                exporter = SQLiteExporter(sqlite_file, timeout=SQLITE_TIMEOUT)
+                try:
+                    exporter.record_failure(topology_name, stats["error"])
+                finally:
+                    exporter.close(create_indexes=False)
+            except sqlite3.Error as sqlite_error:
+                stats["error"] += f" (failure not recorded in {sqlite_file}: {sqlite_error})"
+    stats["seconds"] = round(time.perf_counter() - start, 4)
+    return stats
+
+
+def validate_file(file_name: str, version: str) -> dict:
+    start = time.perf_counter()
+    try:
+        stats = validate_planpro(file_name, PLANPRO_VERSIONS[version]).to_dict()
+        stats["ok"] = stats["valid"]
+    except Exception as e:
+        stats = {"file": file_name, "ok": False, "error": f"{type(e).__name__}: {e}"}
+    stats["seconds"] = round(time.perf_counter() - start, 4)
+    return stats
+
+
+def run_jobs(function, files, version: str, workers: int) -> list[dict]:
+    if workers <= 1 or len(files) <= 1:
+        return [function(file_name, version) for file_name in files]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(function, files, [version] * len(files)))
+
+
+def get_totals(results: list[dict], validation: bool = False) -> dict:
+    """Sums up the results of an import or validation run. For validation runs, failed
+    counts the files that could not be validated at all.
+
+    :param results: The results of the files
+    :param validation: Whether the results are validation reports
+    :return: The totals
+    """
+    if validation:
+        totals = {
+            "files": len(results),
+            "valid": sum(1 for result in results if result.get("valid")),
+            "invalid": sum(1 for result in results if result.get("valid") is False),
+            "failed": sum(1 for result in results if "error" in result),
+            "issues": sum(len(result.get("issues", [])) for result in results),
+        }
+    else:
+        totals = {"files": len(results), "failed": sum(1 for result in results if not result["ok"])}
+        for key in ("nodes", "edges", "signals", "routes"):
+            totals[key] = sum(result.get(key, 0) for result in results)
+    totals["seconds"] = round(sum(result.get("seconds", 0) for result in results), 4)
+    return totals
+
+
+def print_results(results: list[dict], output_format: str, out=sys.stdout, validation: bool = False):
+    totals = get_totals(results, validation)
+    if output_format == "json":
+        json.dump({"results": results, "totals": totals}, out)
+        out.write("\n")
+        out.flush()
+        return
+    for result in results:
+        if "error" in result:
+            out.write(f"FAILED {result['file']}: {result['error']}\n")
+        elif "issues" in result:
+            status = "valid" if result["valid"] else f"{len(result['issues'])} issue(s)"
+            out.write(f"{result['file']}: {status} ({result['seconds']:.3f}s)\n")
+            for issue in result["issues"]:
+                out.write(f"  [{issue['code']}] {issue['message']}\n")
+        else:
+            out.write(
+                f"{result['file']}: {result['nodes']} nodes, {result['edges']} edges, "
+                f"{result['signals']} signals, {result['routes']} routes ({result['seconds']:.3f}s)\n"
+            )
+    if validation:
+        out.write(
+            f"Total: {totals['files']} file(s), {totals['valid']} valid, {totals['invalid']} invalid, "
+            f"{totals['failed']} failed, {totals['issues']} issue(s) ({totals['seconds']:.3f}s)\n"
+        )
+    else:
+        out.write(
+            f"Total: {totals['files']} file(s), {totals['failed']} failed, {totals['nodes']} nodes, "
+            f"{totals['edges']} edges, {totals['signals']} signals, {totals['routes']} routes "
+            f"({totals['seconds']:.3f}s)\n"
+        )
+    out.flush()
+
+
+def watch(args) -> int:
+    store = FingerprintStore(args.state or os.path.join(args.directory, ".planpro-importer-state.json"))
+    function = partial(import_file, sqlite_file=args.sqlite, directory=args.directory)
+    while True:
+        files = collect_files([args.directory])
+        removed_files = store.retain(files)
+        changed_files = [file_name for file_name in files if store.has_changed(file_name)]
+        if args.sqlite is not None and removed_files:
+            exporter = SQLiteExporter(args.sqlite, timeout=SQLITE_TIMEOUT)
+            try:
+                for file_name in removed_files:
+                    exporter.delete_topology(get_topology_name(file_name, args.directory))
+            finally:
+                exporter.close(create_indexes=False)
+        if changed_files:
+            results = run_jobs(function, changed_files, args.planpro_version, args.workers)
+            print_results(results, args.format)
+            # Failed files are stored as well, so they are only retried after their content changed
+            for result in results:
+                store.update(result["file"])
+            if args.sqlite is not None:
+                # The workers skip the indexes, create them once per cycle
+                SQLiteExporter(args.sqlite, timeout=SQLITE_TIMEOUT).close()
+        store.save()
+        if args.once:
+            return 0
+        time.sleep(args.interval)
+
+
+def merge(args) -> int:
+    start = time.perf_counter()
+    topology, report = merge_planpro(
+        collect_files(args.paths), PLANPRO_VERSIONS[args.planpro_version], workers=args.workers, name=args.name
+    )
+    if args.sqlite:
+        export_to_sqlite(topology, args.sqlite)
+    result = report.to_dict()
+    result.update(
+        nodes=len(topology.nodes),
+        edges=len(topology.edges),
+        signals=len(topology.signals),
+        routes=len(topology.routes),
+        seconds=round(time.perf_counter() - start, 4),
+    )
+    if args.format == "json":
+        json.dump(result, sys.stdout)
+        sys.stdout.write("\n")
+    else:
+        for file_name, error in report.failures.items():
+            sys.stdout.write(f"FAILED {file_name}: {error}\n")
+        for conflict in report.conflicts:
+            sys.stdout.write(f"CONFLICT [{conflict.kind}] {conflict.uuid} in {conflict.file_name}: {conflict.message}\n")
+        sys.stdout.write(
+            f"Merged {len(report.files)} file(s): {result['nodes']} nodes, {result['edges']} edges, "
+            f"{result['signals']} signals, {result['routes']} routes, {len(report.conflicts)} conflict(s), "
+            f"{len(report.failures)} failed ({result['seconds']:.3f}s)\n"
+        )
+    return 0 if not report.failures else 1
+
+
+def get_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="planpro-importer", description="Import PlanPro files into yaramo topologies")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--planpro-version", choices=PLANPRO_VERSIONS.keys(), default="1.9")
+    common.add_argument("-w", "--workers", type=int, default=os.cpu_count() or 1, help="number of worker processes")
+    common.add_argument("--format", choices=["summary", "json"], default="summary")
+
+    import_parser = subparsers.add_parser("import", parents=[common], help="import files and directories once")
+    import_parser.add_argument("paths", nargs="+")
+
+    validate_parser = subparsers.add_parser("validate", parents=[common], help="check referential integrity only")
+    validate_parser.add_argument("paths", nargs="+")
+
+    merge_parser = subparsers.add_parser(
+        "merge",
+        parents=[common],
+        help="merge files into one topology",
+        description="Merge files into one topology. The files are imported in threads, "
+        "--workers only sets how many files are read ahead of the merge.",
+    )
+    merge_parser.add_argument("paths", nargs="+")
+    merge_parser.add_argument("--name", default="merged", help="name of the merged topology")
+    merge_parser.add_argument("--sqlite", help="export the merged topology into this SQLite database")
+
+    watch_parser = subparsers.add_parser("watch", parents=[common], help="re-import changed files of a directory")
+    watch_parser.add_argument("directory")
+    watch_parser.add_argument("--state", help="fingerprint store (default: <directory>/.planpro-importer-state.json)")
+    watch_parser.add_argument("--interval", type=float, default=5.0, help="polling interval in seconds")
+    watch_parser.add_argument("--once", action="store_true", help="run a single watch cycle and exit")
+    watch_parser.add_argument("--sqlite", help="replace the topologies of changed files in this SQLite database")
+    return parser
+
+
+def main(argv=None) -> int:
+    args = get_parser().parse_args(argv)
+    if args.command == "merge":
+        return merge(args)
+    if args.command == "watch":
+        try:
+            return watch(args)
+        except KeyboardInterrupt:
+            return 0
+
+    function = import_file if args.command == "import" else validate_file
+    results = run_jobs(function, collect_files(args.paths), args.planpro_version, args.workers)
+    print_results(results, args.format, validation=args.command == "validate")
+    return 0 if all(result["ok"] for result in results) else 1
@@ -0,0 +1,156 @@
+from yaramo.model import DbrefGeoNode
+
+from .utils import Utils
+from .valuepool import ValuePool
+
+
+class GeoNodeCache:
+
+    def __init__(self, container, geo_converter=None, value_pool: ValuePool = None):
+        """The geo node cache resolves every GEO_Knoten of a container only once
+        and shares the created geo nodes between the TOP_Knoten and the
+        intermediate geo nodes of the edges.
+
+        :param container: The container
+        :param geo_converter: The geo converter (optional)
+        :param value_pool: The value pool of the import (optional)
+        """
+        self.container = container
+        self.geo_converter = geo_converter
+        if value_pool is None:
+            value_pool = ValuePool()
+        self.value_pool: ValuePool = value_pool
+        self._geo_points = None
+        self._geo_edges_by_top_edge = None
+        self._coordinates = {}
+        self._geo_nodes = {}
+        self._intermediate_geo_nodes = {}
+
+    def get_geo_point(self, uuid: str):
+        """Gets the geo point of a geo node.
+
+        :param uuid: The uuid of the geo node
+        :return: The geo point or None
+        """
+        if self._geo_points is None:
+            self._geo_points = {}
+            for geo_point in self.container.GEO_Punkt:
+                if geo_point.ID_GEO_Knoten is None:
+                    continue
+                self._geo_points.setdefault(geo_point.ID_GEO_Knoten.Wert, geo_point)
+        return self._geo_points.get(uuid)
+
+    def get_coordinates(self, uuid: str):
+        """Gets the coordinates of a geo node.
+
+        :param uuid: The uuid of the geo node
+        :return: The coordinates (x, y, source, coordinate system)
+        """
+        if uuid not in self._coordinates:
+            x, y, source, coordinate_system = Utils.get_coordinates_of_geo_point(self.get_geo_point(uuid))
+            self._coordinates[uuid] = (
+                x,
+                y,
+                self.value_pool.intern(source, "source"),
+                self.value_pool.intern(coordinate_system, "crs"),
+            )
+        return self._coordinates[uuid]
+
+    def get_geo_node(self, uuid: str) -> DbrefGeoNode:
+        """Gets the geo node of a GEO_Knoten. The geo node is created on the first
+        request and shared afterwards.
+
+        :param uuid: The uuid of the geo node
+        :return: The geo node
+        """
+        geo_node = self._geo_nodes.get(uuid)
+        if geo_node is None:
+            x, y, source, coordinate_system = self.get_coordinates(uuid)
+            geo_node = DbrefGeoNode(
+                x, y, data_source=source, dbref_crs=coordinate_system, uuid=self.value_pool.intern(uuid)
+            )
+            self._geo_nodes[uuid] = geo_node
+        return geo_node
+
+    def get_geo_edges_by_top_edge_uuid(self, top_edge_uuid: str):
+        """Gets all geo edges of a TOP_Kante.
+
+        :param top_edge_uuid: The uuid of the TOP_Kante
+        :return: The list of geo edges
+        """
+        if self._geo_edges_by_top_edge is None:
+            self._geo_edges_by_top_edge = {}
+            for geo_edge in self.container.GEO_Kante:
+                self._geo_edges_by_top_edge.setdefault(geo_edge.ID_GEO_Art.Wert, []).append(geo_edge)
+        return self._geo_edges_by_top_edge.get(top_edge_uuid, [])
+
+    def get_intermediate_geo_nodes(self, geo_edge):
+        """Gets the intermediate geo nodes of a geo edge as computed by the geo converter.
+        The result is computed once per GEO_Kante.
+
+        :param geo_edge: The geo edge
+        :return: The intermediate geo nodes in the order of the converter
+        """
+        geo_edge_uuid = geo_edge.Identitaet.Wert
+        if geo_edge_uuid not in self._intermediate_geo_nodes:
+            geo_point_a = self.get_geo_point(geo_edge.ID_GEO_Knoten_A.Wert)
+            geo_point_b = self.get_geo_point(geo_edge.ID_GEO_Knoten_B.Wert)
+            self._intermediate_geo_nodes[geo_edge_uuid] = list(
+                self.geo_converter.get_intermediate_geo_nodes_of_geo_edge(geo_edge, geo_point_a, geo_point_b)
+            )
+        return self._intermediate_geo_nodes[geo_edge_uuid]
+
+    def get_geo_edge_chain(self, top_edge_uuid: str, geo_node_a_uuid: str, geo_node_b_uuid: str):
+        """Follows the chain of geo edges of a TOP_Kante from the geo node of TOP_Knoten A
+        to the geo node of TOP_Knoten B without resolving any coordinates.
+
+        :param top_edge_uuid: The uuid of the TOP_Kante
+        :param geo_node_a_uuid: The uuid of the geo node of TOP_Knoten A
+        :param geo_node_b_uuid: The uuid of the geo node of TOP_Knoten B
+        :return: The list of (geo edge, uuid of the geo node the geo edge starts at) and the uuid
+                 of the last reached geo node, which is geo_node_b_uuid if the chain is complete
+        """
+        geo_edges = self.get_geo_edges_by_top_edge_uuid(top_edge_uuid)
+
+        def _get_next_edge(_previous_node_uuid, _second_previous_node_uuid):
+            for _geo_edge in geo_edges:
+                if _previous_node_uuid in [
+                    _geo_edge.ID_GEO_Knoten_A.Wert,
+                    _geo_edge.ID_GEO_Knoten_B.Wert,
+                ]:
+                    if _second_previous_node_uuid not in [
+                        _geo_edge.ID_GEO_Knoten_A.Wert,
+                        _geo_edge.ID_GEO_Knoten_B.Wert,
+                    ]:
+                        return _geo_edge
+            return None
+
+        chain = []
+        second_previous_node_uuid = None
+        previous_node_uuid = geo_node_a_uuid
+        while not chain or previous_node_uuid != geo_node_b_uuid:
+            next_edge = _get_next_edge(previous_node_uuid, second_previous_node_uuid)
+            if next_edge is None:
+                break
+            chain.append((next_edge, previous_node_uuid))
+            second_previous_node_uuid = previous_node_uuid
+            if next_edge.ID_GEO_Knoten_A.Wert == previous_node_uuid:
+                previous_node_uuid = next_edge.ID_GEO_Knoten_B.Wert
+            else:
+                previous_node_uuid = next_edge.ID_GEO_Knoten_A.Wert
+        return chain, previous_node_uuid
+
+    def get_intermediate_geo_nodes_of_geo_edge_chain(self, chain):
+        """Gets the intermediate geo nodes of a TOP_Kante from its chain of geo edges.
+
+        :param chain: The chain as returned by get_geo_edge_chain
+        :return: The intermediate geo nodes in order from TOP_Knoten A to TOP_Knoten B
+        """
+        geo_nodes_in_order = []
+        for index, (geo_edge, start_node_uuid) in enumerate(chain):
+            if index > 0:
+                geo_nodes_in_order.append(self.get_geo_node(start_node_uuid))
+            geo_nodes_in_order.extend(Utils.get_intermediate_geo_nodes_of_geo_edge(
+                self.container, geo_edge, start_node_uuid, self.geo_converter, self
+            ))
+        return geo_nodes_in_order
@@ -0,0 +1,95 @@
+from yaramo.model import Edge, Topology
+
+
+class LazyTopology(Topology):
+
+    SECTIONS = ("nodes", "edges", "signals", "routes", "tracks", "point_positions")
+    DEPENDENCIES = {
+        "nodes": (),
+        "edges": ("nodes",),
+        "signals": ("edges",),
+        "routes": ("edges", "signals"),
+        "tracks": ("edges",),
+        "point_positions": ("edges",),
+    }
+
+    def __init__(self, section_reader, **kwargs):
+        """A topology that materialises its sections (nodes, edges, signals, routes,
+        tracks and point positions) on first access. The dependencies of a section are materialised before
+        the section itself.
+
+        :param section_reader: Callable that reads a section (by its name) into the topology
+        """
+        self._sections: dict[str, dict] = {}
+        self._materialised: set[str] = set()
+        self._section_reader = section_reader
+        super().__init__(**kwargs)
+
+    def is_materialised(self, section: str) -> bool:
+        return section in self._materialised
+
+    def materialise(self, section: str = None):
+        """Materialises a section including its dependencies, or all sections if
+        no section is given.
+
+        :param section: The name of the section (optional)
+        """
+        for _section in (section,) if section is not None else self.SECTIONS:
+            getattr(self, _section)
+
+    def _get_section(self, section: str) -> dict:
+        if section not in self._materialised:
+            for dependency in self.DEPENDENCIES[section]:
+                getattr(self, dependency)
+            self._materialised.add(section)
+            try:
+                self._section_reader(section)
+            except BaseException:
+                self._materialised.discard(section)
+                raise
+            if self._materialised.issuperset(self.SECTIONS):
+                # Release the reader, and with it the parsed PlanPro file
+                self._section_reader = None
+        return self._sections.setdefault(section, {})
+
+    def _set_section(self, section: str, value: dict):
+        self._sections[section] = value
+
+
+def _section_property(section: str) -> property:
+    return property(
+        lambda self: self._get_section(section),
+        lambda self, value: self._set_section(section, value),
+    )
+
+
+for _section in LazyTopology.SECTIONS:
+    setattr(LazyTopology, _section, _section_property(_section))
+
+
+class LazyEdge(Edge):
+
+    def __init__(self, *args, **kwargs):
+        """An edge that computes its intermediate geo nodes on first access."""
+        self._intermediate_geo_nodes = []
+        self._geometry_reader = None
+        super().__init__(*args, **kwargs)
+
+    def set_geometry_reader(self, geometry_reader):
+        """Sets the callable that computes the intermediate geo nodes on first access.
+
+        :param geometry_reader: Callable returning the intermediate geo nodes
+        """
+        self._geometry_reader = geometry_reader
+
+    @property
+    def intermediate_geo_nodes(self):
+        if self._geometry_reader is not None:
+            self._intermediate_geo_nodes = self._geometry_reader()
+            self._geometry_reader = None
+        return self._intermediate_geo_nodes
+
+    @intermediate_geo_nodes.setter
+    def intermediate_geo_nodes(self, value):
+        self._geometry_reader = None
+        self._intermediate_geo_nodes = value
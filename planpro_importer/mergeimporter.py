@@ -0,0 +1,270 @@
+import math
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from yaramo.model import Topology
+
+from .planproimporter import import_planpro
+from .planproversion import PlanProVersion
+from .valuepool import ValuePool
+
+CONNECTION_SLOTS = ("head", "left", "right")
+
+
+class MergeConflict:
+
+    def __init__(self, kind: str, uuid: str, file_name: str, message: str):
+        """A duplicate element that differs from the already merged element.
+
+        :param kind: The kind of the element (node, edge, signal, route or track)
+        :param uuid: The uuid of the element
+        :param file_name: The file of the rejected duplicate
+        :param message: A human readable description
+        """
+        self.kind = kind
+        self.uuid = uuid
+        self.file_name = file_name
+        self.message = message
+
+    def to_dict(self):
+        return {"kind": self.kind, "uuid": self.uuid, "file": self.file_name, "message": self.message}
+
+    def __repr__(self):
+        return f"MergeConflict({self.kind}, {self.uuid})"
+
+
+class MergeReport:
+
+    def __init__(self):
+        """The result of merging several topologies."""
+        self.files: list[str] = []
+        self.duplicates: dict[str, int] = {"node": 0, "edge": 0, "signal": 0, "route": 0, "track": 0}
+        self.conflicts: list[MergeConflict] = []
+        self.failures: dict[str, str] = {}
+
+    def add_conflict(self, kind: str, uuid: str, file_name: str, message: str):
+        self.conflicts.append(MergeConflict(kind, uuid, file_name, message))
+
+    def add_failure(self, file_name: str, error: Exception):
+        self.failures[file_name] = f"{type(error).__name__}: {error}"
+
+    def to_dict(self):
+        return {
+            "files": self.files,
+            "duplicates": self.duplicates,
+            "conflicts": [conflict.to_dict() for conflict in self.conflicts],
+            "failures": self.failures,
+        }
+
+
+class TopologyMerger:
+
+    def __init__(self, name: str = "merged", coordinate_tolerance: float = 1e-3):
+        """Merges topologies into one topology. Elements are identified by their UUID,
+        the first occurrence of an element is kept. Duplicates that differ from the
+        kept element are reported as conflicts.
+
+        :param name: The name of the merged topology
+        :param coordinate_tolerance: The tolerance when comparing coordinates of duplicate nodes
+        """
+        self.topology = Topology(name=name)
+        self.topology.point_positions = {}
+        self.report = MergeReport()
+        self.coordinate_tolerance = coordinate_tolerance
+        # The (node uuid, slot) of the connections of boundary edges moved to a free slot
+        self._moved_connections: set[tuple[str, str]] = set()
+
+    def add_topology(self, topology: Topology, file_name: str = None):
+        """Merges a topology into the merged topology. The elements of the given topology
+        are taken over and linked to the already merged elements, so the given topology
+        must not be used afterwards.
+
+        :param topology: The topology to merge
+        :param file_name: The file of the topology (for the report)
+        """
+        file_name = file_name or topology.name
+        self.report.files.append(file_name)
+
+        for node in topology.nodes.values():
+            self._add_node(node, file_name)
+        for edge in topology.edges.values():
+            self._add_edge(edge, file_name)
+        for signal in topology.signals.values():
+            self._add_signal(signal, file_name)
+        for route in topology.routes.values():
+            self._add_route(route, file_name)
+        for track in topology.tracks.values():
+            self._add_track(track, file_name)
+        for component_uuid, position in getattr(topology, "point_positions", {}).items():
+            self.topology.point_positions.setdefault(component_uuid, position)
+
+    def _add_node(self, node, file_name: str):
+        existing = self.topology.nodes.get(node.uuid)
+        if existing is None:
+            self.topology.add_node(node)
+            return
+        self.report.duplicates["node"] += 1
+        if existing.geo_node is not None and node.geo_node is not None:
+            if not (
+                math.isclose(existing.geo_node.x, node.geo_node.x, abs_tol=self.coordinate_tolerance)
+                and math.isclose(existing.geo_node.y, node.geo_node.y, abs_tol=self.coordinate_tolerance)
+            ):
+                self.report.add_conflict("node", node.uuid, file_name, "Node has different coordinates")
+
+    def _link_to_merged_node(self, node, edge, file_name: str):
+        """Gets the merged node of a node of the given edge and connects the edge to it
+        in the same slot (head, left or right) as in its own file.
+
+        Files meeting at a shared node that is no point each connect their own edge on
+        the head of the node. Such an edge is connected on a free slot of the merged node
+        instead. Only a clash of two left or two right connections is a conflict.
+
+        :param node: The node of the edge in its own file
+        :param edge: The edge
+        :param file_name: The file of the edge
+        :return: The merged node
+        """
+        merged_node = self.topology.nodes[node.uuid]
+        if merged_node is node:
+            return node
+        for slot in CONNECTION_SLOTS:
+            if getattr(node, f"connected_on_{slot}") is not edge:
+                continue
+            connected_edge = getattr(merged_node, f"connected_on_{slot}")
+            if connected_edge is None:
+                getattr(merged_node, f"set_connection_{slot}_edge")(edge)
+            elif connected_edge.uuid == edge.uuid:
+                continue
+            elif slot == "head":
+                if not self._connect_on_free_slot(merged_node, edge):
+                    self._add_connection_conflict(merged_node, slot, connected_edge, edge, file_name)
+            elif (merged_node.uuid, slot) in self._moved_connections:
+                # The slot was only lent to a boundary edge, move that edge on
+                self._moved_connections.discard((merged_node.uuid, slot))
+                getattr(merged_node, f"set_connection_{slot}_edge")(edge)
+                if not self._connect_on_free_slot(merged_node, connected_edge):
+                    self._add_connection_conflict(merged_node, slot, edge, connected_edge, file_name)
+            else:
+                self._add_connection_conflict(merged_node, slot, connected_edge, edge, file_name)
+        return merged_node
+
+    def _connect_on_free_slot(self, merged_node, edge) -> bool:
+        for slot in CONNECTION_SLOTS:
+            if getattr(merged_node, f"connected_on_{slot}") is None:
+                getattr(merged_node, f"set_connection_{slot}_edge")(edge)
+                self._moved_connections.add((merged_node.uuid, slot))
+                return True
+        return False
+
+    def _add_connection_conflict(self, merged_node, slot: str, connected_edge, edge, file_name: str):
+        self.report.add_conflict(
+            "node",
+            merged_node.uuid,
+            file_name,
+            f"The {slot} connection is already used by edge {connected_edge.uuid}, "
+            f"can not connect edge {edge.uuid}",
+        )
+
+    def _add_edge(self, edge, file_name: str):
+        existing = self.topology.edges.get(edge.uuid)
+        if existing is not None:
+            self.report.duplicates["edge"] += 1
+            if {existing.node_a.uuid, existing.node_b.uuid} != {edge.node_a.uuid, edge.node_b.uuid}:
+                self.report.add_conflict("edge", edge.uuid, file_name, "Edge connects different nodes")
+            elif existing.length is not None and edge.length is not None and float(existing.length) != float(edge.length):
+                self.report.add_conflict("edge", edge.uuid, file_name, "Edge has a different length")
+            return
+        edge.node_a = self._link_to_merged_node(edge.node_a, edge, file_name)
+        edge.node_b = self._link_to_merged_node(edge.node_b, edge, file_name)
+        self.topology.add_edge(edge)
+
+    def _add_signal(self, signal, file_name: str):
+        existing = self.topology.signals.get(signal.uuid)
+        if existing is not None:
+            self.report.duplicates["signal"] += 1
+            if existing.edge.uuid != signal.edge.uuid or float(existing.distance_edge) != float(signal.distance_edge):
+                self.report.add_conflict("signal", signal.uuid, file_name, "Signal has a different position")
+            return
+        merged_edge = self.topology.edges[signal.edge.uuid]
+        if merged_edge is not signal.edge:
+            signal.edge = merged_edge
+            merged_edge.signals.append(signal)
+        self.topology.add_signal(signal)
+
+    def _add_route(self, route, file_name: str):
+        existing = self.topology.routes.get(route.uuid)
+        if existing is not None:
+            self.report.duplicates["route"] += 1
+            if (
+                existing.start_signal.uuid != route.start_signal.uuid
+                or existing.end_signal.uuid != route.end_signal.uuid
+            ):
+                self.report.add_conflict("route", route.uuid, file_name, "Route has different start or target signal")
+            return
+        route.start_signal = self.topology.signals[route.start_signal.uuid]
+        route.end_signal = self.topology.signals[route.end_signal.uuid]
+        route.edges = {self.topology.edges[edge.uuid] for edge in route.edges}
+        self.topology.add_route(route)
+
+    @staticmethod
+    def _get_track_sections(track):
+        return [(edge.uuid, float(start), float(end)) for edge, start, end in track.edges]
+
+    def _add_track(self, track, file_name: str):
+        existing = self.topology.tracks.get(track.uuid)
+        if existing is not None:
+            self.report.duplicates["track"] += 1
+            if self._get_track_sections(existing) != self._get_track_sections(track):
+                self.report.add_conflict("track", track.uuid, file_name, "Track has different sections")
+            return
+        track.edges = [(self.topology.edges[edge.uuid], start, end) for edge, start, end in track.edges]
+        self.topology.add_track(track)
+
+
+def merge_planpro(
+    planpro_files, planpro_version: PlanProVersion = PlanProVersion.PlanPro19, geo_converter=None,
+    workers: int = 1, name: str = "merged", value_pool: ValuePool = None,
+) -> tuple[Topology, MergeReport]:
+    """Imports several PlanPro files and merges them into one topology. The files are merged
+    in the given order, at most two files per worker are imported ahead of the merge, so the
+    parsed documents of all files are never held at the same time. Files that can not be
+    imported are skipped and listed as failures in the merge report.
+
+    The files are imported in threads. Parsing with lxml can overlap with the merge, but
+    the readers hold the GIL, so more workers mainly read further ahead and do not make
+    the import of the files faster.
+
+    :param planpro_files: The PlanPro files
+    :param planpro_version: The PlanPro version of the files
+    :param geo_converter: The geo converter (optional)
+    :param workers: The number of import threads, which limits how many files are read ahead
+    :param name: The name of the merged topology
+    :param value_pool: The value pool shared by all files (optional)
+    :return: The merged topology and the merge report
+    """
+    if value_pool is None:
+        value_pool = ValuePool()
+    merger = TopologyMerger(name)
+    files = iter(planpro_files)
+    with ThreadPoolExecutor(max_workers=max(workers, 1)) as executor:
+        pending = deque()
+
+        def _submit_next():
+            file_name = next(files, None)
+            if file_name is not None:
+                pending.append((file_name, executor.submit(
+                    import_planpro, file_name, planpro_version, geo_converter, value_pool=value_pool
+                )))
+
+        for _ in range(2 * max(workers, 1)):
+            _submit_next()
+        while pending:
+            file_name, future = pending.popleft()
+            _submit_next()
+            try:
+                topology = future.result()
+            except Exception as e:
+                merger.report.add_failure(file_name, e)
+                continue
+            merger.add_topology(topology, file_name)
+    return merger.topology, merger.report
@@ -1,35 +1,43 @@
 import logging
 
-from yaramo.model import DbrefGeoNode, Node, Topology
+from yaramo.model import Node, Topology
 
 from .model110 import CContainer
-from ..utils import Utils
+from ..geonodecache import GeoNodeCache
+from ..positioncalculator import PositionCalculator
+from ..valuepool import ValuePool
 
 
 class NodeReader:
 
-    def __init__(self, topology: Topology, container: CContainer):
+    def __init__(self, topology: Topology, container: CContainer, geo_node_cache: GeoNodeCache = None):
         """The node reader reads all nodes from a container and adds them
         to the topology.
 
         :param topology: The topology
         :param container: The container
+        :param geo_node_cache: The geo node cache of the container (optional)
         """
         self.topology: Topology = topology
         self.container: CContainer = container
+        if geo_node_cache is None:
+            geo_node_cache = GeoNodeCache(container)
+        self.geo_node_cache: GeoNodeCache = geo_node_cache
+        self.value_pool: ValuePool = geo_node_cache.value_pool
+        self._top_edges = None
 
     def read_nodes(self):
         """Read the nodes from the container."""
 
         for top_knoten in self.container.TOP_Knoten:
-            node_obj = Node(uuid=top_knoten.Identitaet.Wert)
+            node_obj = Node(uuid=self.value_pool.intern(top_knoten.Identitaet.Wert))
 
             # Coordinates
             geo_node_uuid = top_knoten.ID_GEO_Knoten.Wert
-            x, y, source, coordinate_system = Utils.get_coordinates_of_geo_node(self.container, geo_node_uuid)
+            x, y, _, _ = self.geo_node_cache.get_coordinates(geo_node_uuid)
             if x is None or y is None:
                 continue
-            node_obj.geo_node = DbrefGeoNode(x, y, data_source=source, dbref_crs=coordinate_system, uuid=geo_node_uuid)
+            node_obj.geo_node = self.geo_node_cache.get_geo_node(geo_node_uuid)
 
             self.topology.add_node(node_obj)
 
@@ -62,6 +70,36 @@ class NodeReader:
                 w_kr_drive = w_kr_zungenpaar.Elektrischer_Antrieb_Anzahl.Wert
                 w_kr_element_point.drive_amount = w_kr_drive
 
+    def compute_point_positions(self, position_calculator: PositionCalculator) -> dict:
+        """Computes the positions of the point components (W_Kr_Gsp_Komponente) placed
+        on the edges, like the positions of signals. Each component is located at its
+        first placement (Punkt_Objekt_TOP_Kante).
+
+        :param position_calculator: The position calculator of the topology
+        :return: Dict of component uuid to position
+        """
+        point_objects = []
+        for component in self.container.W_Kr_Gsp_Komponente:
+            if not component.Punkt_Objekt_TOP_Kante:
+                continue
+            top_edge_xml = component.Punkt_Objekt_TOP_Kante[0]
+            edge = self.topology.edges.get(top_edge_xml.ID_TOP_Kante.Wert)
+            if edge is None:
+                continue
+            side_distance = 0.0
+            if top_edge_xml.Seitlicher_Abstand is not None:
+                side_distance = top_edge_xml.Seitlicher_Abstand.Wert
+            direction = None
+            if top_edge_xml.Wirkrichtung is not None:
+                direction = top_edge_xml.Wirkrichtung.Wert
+            point_objects.append((
+                self.value_pool.intern(component.Identitaet.Wert),
+                edge,
+                top_edge_xml.Abstand.Wert,
+                side_distance,
+                direction,
+            ))
+        return position_calculator.locate(point_objects)
 
     def get_component_by_element_uuid(self, element_uuid: str):
         """Gets the point component (W_Kr_Gsp_Komponente) by the
@@ -75,39 +113,49 @@ class NodeReader:
                 return point_component
         return None
 
+    def get_top_edge(self, top_edge_uuid: str):
+        """Gets a TOP_Kante of the container by its uuid.
+
+        :param top_edge_uuid: The uuid of the TOP_Kante
+        :return: The TOP_Kante or None
+        """
+        if self._top_edges is None:
+            self._top_edges = {top_kante.Identitaet.Wert: top_kante for top_kante in self.container.TOP_Kante}
+        return self._top_edges.get(top_edge_uuid)
+
     def get_point_of_component(self, component):
-        """Gets the point, the TOP node, described by the component. Returns None,
-        if some error occurs.
+        """Gets the point, the TOP node, described by the component. The point is
+        found through the TOP_Kanten of the container, so the edges of the topology
+        are not needed. Returns None, if some error occurs.
 
         :param component: The point component
         :return: The top node or None.
         """
-        point = None
+        point_uuid = None
         for top_edge_xml in component.Punkt_Objekt_TOP_Kante:
             top_edge_uuid = top_edge_xml.ID_TOP_Kante.Wert
-            if top_edge_uuid not in self.topology.edges:
+            top_kante = self.get_top_edge(top_edge_uuid)
+            if top_kante is None:
                 logging.error(
                     f"TOP_Kante with UUID {top_edge_uuid} not found during "
                     f"setting the point names"
                 )
                 return None
-            top_edge = self.topology.edges[top_edge_uuid]
             distance = float(top_edge_xml.Abstand.Wert)
-            point_on_top_edge = None
             if distance == 0.0:
-                point_on_top_edge = top_edge.node_a
-            elif top_edge.length == distance:
-                point_on_top_edge = top_edge.node_b
+                node_uuid = top_kante.ID_TOP_Knoten_A.Wert
+            elif float(top_kante.TOP_Kante_Allg.TOP_Laenge.Wert) == distance:
+                node_uuid = top_kante.ID_TOP_Knoten_B.Wert
             else:
                 # This case can happen when there is a lock-object. Ignore these.
                 return None
 
-            if point is None:
-                point = point_on_top_edge
-            elif point.uuid != point.uuid:
+            if point_uuid is None:
+                point_uuid = node_uuid
+            elif point_uuid != node_uuid:
                 logging.error(
                     f"Point component {component.Identitaet.Wert} points to different "
                     f"TOP_Knoten."
                 )
                 return None
-        return point
+        return self.topology.nodes.get(point_uuid)
@@ -1,25 +1,43 @@
 from datetime import datetime
+from functools import partial
 from pathlib import Path
 
-from yaramo.model import DbrefGeoNode, Edge, Node, Route, Signal, Topology, Track
+from yaramo.model import Edge, Node, Route, Signal, Topology, Track
 
 from .model110 import parse
 from .nodereader import NodeReader
 from .signalreader import SignalReader
+from ..geonodecache import GeoNodeCache
+from ..lazytopology import LazyEdge, LazyTopology
+from ..positioncalculator import PositionCalculator
 from ..utils import Utils
+from ..valuepool import ValuePool
 from ..routereader import RouteReader
 
 
 class PlanProReader110(object):
 
-    def __init__(self, plan_pro_file_name, geo_converter=None):
+    def __init__(self, plan_pro_file_name, geo_converter=None, compute_positions=False, value_pool=None, lazy=False):
         if not plan_pro_file_name.endswith(".ppxml"):
             plan_pro_file_name = plan_pro_file_name + ".ppxml"
         self.plan_pro_file_name = plan_pro_file_name
         self.geo_converter = geo_converter
+        self.compute_positions = compute_positions
+        if value_pool is None:
+            value_pool = ValuePool()
+        self.value_pool = value_pool
+        self.lazy = lazy
         self.root_object = parse(self.plan_pro_file_name, silence=True)
-
-        self.topology = Topology(name=Path(self.plan_pro_file_name).stem)
+        self.container = Utils.get_container(self.root_object)
+        self.geo_node_caches = [
+            GeoNodeCache(_container, self.geo_converter, self.value_pool) for _container in self.container
+        ]
+
+        if lazy:
+            self.topology = LazyTopology(self.read_section, name=Path(self.plan_pro_file_name).stem)
+        else:
+            self.topology = Topology(name=Path(self.plan_pro_file_name).stem)
+            self.topology.point_positions = {}
         self.topology.created_at = self._get_created_at()
         self.topology.created_with = self._get_created_with()
 
@@ -41,113 +59,97 @@ class PlanProReader110(object):
         return f"{tool} (Version: {version})"
 
     def read_topology_from_plan_pro_file(self):
-        container = Utils.get_container(self.root_object)
-
-        for _container in container:
-            node_reader = NodeReader(self.topology, _container)
-            node_reader.read_nodes()
-            self.read_edges_from_container(_container)
-            node_reader.add_point_names()
-            node_reader.get_drive_amounts()
-        for _container in container:
-            reader = SignalReader(self.topology, _container)
-            reader.read_signals_from_container()
-        for _container in container:
-            RouteReader.read_routes_from_container(_container, self.topology)
+        """Reads the topology. In lazy mode, the sections of the topology are only read
+        on first access.
 
+        :return: The topology
+        """
+        if not self.lazy:
+            for section in LazyTopology.SECTIONS:
+                self.read_section(section)
         return self.topology
 
-    def read_edges_from_container(self, container):
+    def read_section(self, section: str):
+        """Reads a section (nodes, edges, signals, routes, tracks or point_positions) of all
+        containers into the topology.
+
+        :param section: The name of the section
+        """
+        if section == "nodes":
+            node_readers = self.get_node_readers()
+            for node_reader in node_readers:
+                node_reader.read_nodes()
+            for node_reader in node_readers:
+                node_reader.add_point_names()
+                node_reader.get_drive_amounts()
+        elif section == "edges":
+            for _container, geo_node_cache in zip(self.container, self.geo_node_caches):
+                self.read_edges_from_container(_container, geo_node_cache)
+        elif section == "signals":
+            for _container in self.container:
+                reader = SignalReader(self.topology, _container, self.value_pool)
+                reader.read_signals_from_container()
+            if self.compute_positions:
+                PositionCalculator(self.topology).compute_signal_positions()
+        elif section == "routes":
+            for _container in self.container:
+                RouteReader.read_routes_from_container(_container, self.topology, self.value_pool)
+        elif section == "tracks":
+            for _container in self.container:
+                self.read_tracks_from_container(_container)
+        elif section == "point_positions":
+            if self.compute_positions:
+                position_calculator = PositionCalculator(self.topology)
+                for node_reader in self.get_node_readers():
+                    self.topology.point_positions.update(node_reader.compute_point_positions(position_calculator))
+
+    def get_node_readers(self) -> list[NodeReader]:
+        return [
+            NodeReader(self.topology, _container, geo_node_cache)
+            for _container, geo_node_cache in zip(self.container, self.geo_node_caches)
+        ]
+
+    def read_edges_from_container(self, container, geo_node_cache=None):
+        if geo_node_cache is None:
+            geo_node_cache = GeoNodeCache(container, self.geo_converter, self.value_pool)
         for top_kante in container.TOP_Kante:
-            top_kante_uuid = top_kante.Identitaet.Wert
+            top_kante_uuid = self.value_pool.intern(top_kante.Identitaet.Wert)
             length = float(top_kante.TOP_Kante_Allg.TOP_Laenge.Wert)
             node_a = self.topology.nodes[top_kante.ID_TOP_Knoten_A.Wert]
             node_b = self.topology.nodes[top_kante.ID_TOP_Knoten_B.Wert]
-            edge = Edge(node_a, node_b, length=length, uuid=top_kante_uuid)
+            if self.lazy:
+                edge = LazyEdge(node_a, node_b, length=length, uuid=top_kante_uuid)
+            else:
+                edge = Edge(node_a, node_b, length=length, uuid=top_kante_uuid)
 
             # Anschluss
             Utils.set_connection(top_kante.TOP_Kante_Allg.TOP_Anschluss_A.Wert, node_a, edge)
             Utils.set_connection(top_kante.TOP_Kante_Allg.TOP_Anschluss_B.Wert, node_b, edge)
 
-            length_remaining = length
-
             # Intermediate geo nodes
-            geo_edges = Utils.get_all_geo_edges_by_top_edge_uuid(
-                container, top_kante_uuid
+            chain, last_node_uuid = geo_node_cache.get_geo_edge_chain(
+                top_kante_uuid, node_a.geo_node.uuid, node_b.geo_node.uuid
             )
-
-            first_edge = None
-            for geo_edge in geo_edges:
-                if node_a.geo_node.uuid in [
-                    geo_edge.ID_GEO_Knoten_A.Wert,
-                    geo_edge.ID_GEO_Knoten_B.Wert,
-                ]:
-                    first_edge = geo_edge
-                    break
-
-            def _get_other_uuid(_uuid, _edge):
-                if _edge.ID_GEO_Knoten_A.Wert == _uuid:
-                    return _edge.ID_GEO_Knoten_B.Wert
-                return _edge.ID_GEO_Knoten_A.Wert
-
-            second_previous_node_uuid = node_a.geo_node.uuid
-            previous_node_uuid = _get_other_uuid(node_a.geo_node.uuid, first_edge)
-            geo_nodes_in_order = []
-            geo_nodes_in_order.extend(Utils.get_intermediate_geo_nodes_of_geo_edge(container, first_edge, second_previous_node_uuid, self.geo_converter))
-
-            def _get_next_edge(_previous_node_uuid, _second_previous_node_uuid):
-                for _geo_edge in geo_edges:
-                    if _previous_node_uuid in [
-                        _geo_edge.ID_GEO_Knoten_A.Wert,
-                        _geo_edge.ID_GEO_Knoten_B.Wert,
-                    ]:
-                        if _second_previous_node_uuid not in [
-                            _geo_edge.ID_GEO_Knoten_A.Wert,
-                            _geo_edge.ID_GEO_Knoten_B.Wert,
-                        ]:
-                            return _geo_edge
-                return None
-
-            completed = True
-            while previous_node_uuid != node_b.geo_node.uuid:
-                x, y, source, coordinate_system = Utils.get_coordinates_of_geo_node(
-                    container, previous_node_uuid
-                )
-                geo_node = DbrefGeoNode(x, y, data_source=source, dbref_crs=coordinate_system, uuid=previous_node_uuid)
-                geo_nodes_in_order.append(geo_node)
-
-                next_edge = _get_next_edge(
-                    previous_node_uuid, second_previous_node_uuid
-                )
-                if next_edge is None:
-                    completed = False
-                    break
-
-                geo_nodes_in_order.extend(Utils.get_intermediate_geo_nodes_of_geo_edge(container, next_edge, previous_node_uuid, self.geo_converter))
-
-                second_previous_node_uuid = previous_node_uuid
-                length_remaining = length_remaining - float(
-                    next_edge.GEO_Kante_Allg.GEO_Laenge.Wert
-                )
-                previous_node_uuid = _get_other_uuid(
-                    second_previous_node_uuid, next_edge
-                )
-
-            if completed:
-                edge.intermediate_geo_nodes = geo_nodes_in_order
-                self.topology.add_edge(edge)
-            else:
+            if last_node_uuid != node_b.geo_node.uuid:
                 print(
                     f"Warning: TOP_EDGE {top_kante_uuid} could not be completed, "
-                    f"since the chain of geo edges is broken after {previous_node_uuid}. "
+                    f"since the chain of geo edges is broken after {last_node_uuid}. "
                     "This may cause errors later, since the topology is broken."
                 )
                 node_a.remove_edge(edge)
                 node_b.remove_edge(edge)
+                continue
+
+            if self.lazy:
+                edge.set_geometry_reader(partial(geo_node_cache.get_intermediate_geo_nodes_of_geo_edge_chain, chain))
+            else:
+                edge.intermediate_geo_nodes = geo_node_cache.get_intermediate_geo_nodes_of_geo_edge_chain(chain)
+            self.topology.add_edge(edge)
 
+    def read_tracks_from_container(self, container):
         for track in container.Gleis_Art:
-            uuid = track.Identitaet.Wert
-            track_type = track.Gleisart.Wert
+            uuid = self.value_pool.intern(track.Identitaet.Wert)
+            track_type = self.value_pool.intern(track.Gleisart.Wert, "track_type")
             track_obj = Track(track_type, uuid=uuid)
             for section in track.Bereich_Objekt_Teilbereich:
                 section_start = section.Begrenzung_A.Wert
@@ -5,18 +5,23 @@ from yaramo.model import (Signal, SignalFunction, SignalKind, SignalState,
                           SignalSystem, Topology)
 
 from .model110 import CContainer
+from ..valuepool import ValuePool
 
 
 class SignalReader:
 
-    def __init__(self, topology: Topology, container: CContainer):
+    def __init__(self, topology: Topology, container: CContainer, value_pool: ValuePool = None):
         """Reads all signals of a container and adds them to the topology
 
         :param topology: The yaramo topology
         :param container: The XML-container of the PlanPro file
+        :param value_pool: The value pool of the import (optional)
         """
         self.topology: Topology = topology
         self.container: CContainer = container
+        if value_pool is None:
+            value_pool = ValuePool()
+        self.value_pool: ValuePool = value_pool
 
     def get_signal_frames_by_signal_uuid(self, signal_uuid: str):
         """Gets all frames of a signal identified by its UUID
@@ -169,16 +174,16 @@ class SignalReader:
             if signal.Signal_Real is not None:
                 system = self.get_signal_system(signal)
             signal_obj = Signal(
-                uuid=signal_uuid,
-                function=function,
-                kind=self.get_signal_kind(signal),
+                uuid=self.value_pool.intern(signal_uuid),
+                function=self.value_pool.intern(function, "signal_function"),
+                kind=self.value_pool.intern(self.get_signal_kind(signal), "signal_kind"),
                 name=bezeichnung,
                 edge=self.topology.edges[top_kante_id],
-                direction=signal.Punkt_Objekt_TOP_Kante[0].Wirkrichtung.Wert,
+                direction=self.value_pool.intern(signal.Punkt_Objekt_TOP_Kante[0].Wirkrichtung.Wert, "direction"),
                 side_distance=self.get_side_distance(signal),
                 distance_edge=signal.Punkt_Objekt_TOP_Kante[0].Abstand.Wert,
                 supported_states=supported_states,
-                system=system,
+                system=self.value_pool.intern(system, "signal_system"),
             )
             self.topology.add_signal(signal_obj)
             signal_obj.edge.signals.append(signal_obj)
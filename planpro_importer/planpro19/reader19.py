@@ -1,105 +1,110 @@
-from yaramo.model import DbrefGeoNode, Edge, Node, Route, Signal, Topology
+from functools import partial
+
+from yaramo.model import Edge, Node, Route, Signal, Topology
+from ..geonodecache import GeoNodeCache
+from ..lazytopology import LazyEdge, LazyTopology
+from ..positioncalculator import PositionCalculator
 from ..utils import Utils
+from ..valuepool import ValuePool
 from .model19 import parse
 from ..routereader import RouteReader
 
 
 class PlanProReader19(object):
 
-    def __init__(self, plan_pro_file_name, geo_converter = None):
+    def __init__(self, plan_pro_file_name, geo_converter = None, compute_positions = False, value_pool = None, lazy = False):
         if not plan_pro_file_name.endswith(".ppxml"):
             plan_pro_file_name = plan_pro_file_name + ".ppxml"
         self.plan_pro_file_name = plan_pro_file_name
         self.geo_converter = geo_converter
-        self.topology = Topology(name=self.plan_pro_file_name.split("/")[-1][:-6])
+        self.compute_positions = compute_positions
+        if value_pool is None:
+            value_pool = ValuePool()
+        self.value_pool = value_pool
+        self.lazy = lazy
+        self.container = []
+        self.geo_node_caches = []
+        if lazy:
+            self.topology = LazyTopology(self.read_section, name=self.plan_pro_file_name.split("/")[-1][:-6])
+        else:
+            self.topology = Topology(name=self.plan_pro_file_name.split("/")[-1][:-6])
+            self.topology.point_positions = {}
 
     def read_topology_from_plan_pro_file(self):
         root_object = parse(self.plan_pro_file_name, silence=True)
-        container = Utils.get_container(root_object)
+        self.container = Utils.get_container(root_object)
+        self.geo_node_caches = [GeoNodeCache(c, self.geo_converter, self.value_pool) for c in self.container]
 
-        for c in container:
-            self.read_topology_from_container(c)
-        for c in container:
-            self.read_signals_from_container(c)
-        for c in container:
-            RouteReader.read_routes_from_container(c, self.topology)
+        if not self.lazy:
+            for section in LazyTopology.SECTIONS:
+                self.read_section(section)
 
         return self.topology
 
+    def read_section(self, section):
+        if section == "nodes":
+            for c, geo_node_cache in zip(self.container, self.geo_node_caches):
+                self.read_nodes_from_container(c, geo_node_cache)
+        elif section == "edges":
+            for c, geo_node_cache in zip(self.container, self.geo_node_caches):
+                self.read_edges_from_container(c, geo_node_cache)
+        elif section == "signals":
+            for c in self.container:
+                self.read_signals_from_container(c)
+            if self.compute_positions:
+                PositionCalculator(self.topology).compute_signal_positions()
+        elif section == "routes":
+            for c in self.container:
+                RouteReader.read_routes_from_container(c, self.topology, self.value_pool)
+
     def read_topology_from_container(self, container):
+        geo_node_cache = GeoNodeCache(container, self.geo_converter, self.value_pool)
+        self.read_nodes_from_container(container, geo_node_cache)
+        self.read_edges_from_container(container, geo_node_cache)
+
+    def read_nodes_from_container(self, container, geo_node_cache):
         for top_knoten in container.TOP_Knoten:
-            top_knoten_uuid = top_knoten.Identitaet.Wert
+            top_knoten_uuid = self.value_pool.intern(top_knoten.Identitaet.Wert)
             node_obj = Node(uuid=top_knoten_uuid)
 
             # Coordinates
             geo_node_uuid = top_knoten.ID_GEO_Knoten.Wert
-            x, y, source, coordinate_system = Utils.get_coordinates_of_geo_node(container, geo_node_uuid)
+            x, y, _, _ = geo_node_cache.get_coordinates(geo_node_uuid)
             if x is None or y is None:
                 continue
-            node_obj.geo_node = DbrefGeoNode(x, y, data_source=source, dbref_crs=coordinate_system, uuid=geo_node_uuid)
+            node_obj.geo_node = geo_node_cache.get_geo_node(geo_node_uuid)
 
             self.topology.add_node(node_obj)
 
+    def read_edges_from_container(self, container, geo_node_cache):
         for top_kante in container.TOP_Kante:
-            top_kante_uuid = top_kante.Identitaet.Wert
+            top_kante_uuid = self.value_pool.intern(top_kante.Identitaet.Wert)
             length = top_kante.TOP_Kante_Allg.TOP_Laenge.Wert
             node_a = self.topology.nodes[top_kante.ID_TOP_Knoten_A.Wert]
             node_b = self.topology.nodes[top_kante.ID_TOP_Knoten_B.Wert]
-            edge = Edge(node_a, node_b, length=length, uuid=top_kante_uuid)
+            if self.lazy:
+                edge = LazyEdge(node_a, node_b, length=length, uuid=top_kante_uuid)
+            else:
+                edge = Edge(node_a, node_b, length=length, uuid=top_kante_uuid)
 
             # Anschluss
             Utils.set_connection(top_kante.TOP_Kante_Allg.TOP_Anschluss_A.Wert, node_a, edge)
             Utils.set_connection(top_kante.TOP_Kante_Allg.TOP_Anschluss_B.Wert, node_b, edge)
 
             # Intermediate geo nodes
-            geo_edges = Utils.get_all_geo_edges_by_top_edge_uuid(
-                container, top_kante_uuid
+            chain, last_node_uuid = geo_node_cache.get_geo_edge_chain(
+                top_kante_uuid, node_a.geo_node.uuid, node_b.geo_node.uuid
             )
-
-            first_edge = None
-            for geo_edge in geo_edges:
-                if node_a.geo_node.uuid in [
-                    geo_edge.ID_GEO_Knoten_A.Wert,
-                    geo_edge.ID_GEO_Knoten_B.Wert,
-                ]:
-                    first_edge = geo_edge
-                    break
-
-            def _get_other_uuid(_uuid, _edge):
-                if _edge.ID_GEO_Knoten_A.Wert == _uuid:
-                    return _edge.ID_GEO_Knoten_B.Wert
-                return _edge.ID_GEO_Knoten_A.Wert
-
-            second_last_node_uuid = node_a.geo_node.uuid
-            last_node_uuid = _get_other_uuid(node_a.geo_node.uuid, first_edge)
-            geo_nodes_in_order = []
-            geo_nodes_in_order.extend(Utils.get_intermediate_geo_nodes_of_geo_edge(container, first_edge, second_last_node_uuid, self.geo_converter))
-
-            def _get_next_edge(_last_node_uuid, _second_last_node):
-                for _geo_edge in geo_edges:
-                    if _last_node_uuid in [
-                        _geo_edge.ID_GEO_Knoten_A.Wert,
-                        _geo_edge.ID_GEO_Knoten_B.Wert,
-                    ]:
-                        if _second_last_node not in [
-                            _geo_edge.ID_GEO_Knoten_A.Wert,
-                            _geo_edge.ID_GEO_Knoten_B.Wert,
-                        ]:
-                            return _geo_edge
-                return None
-
-            while last_node_uuid != node_b.geo_node.uuid:
-                x, y, source, coordinate_system = Utils.get_coordinates_of_geo_node(container, last_node_uuid)
-                geo_node = DbrefGeoNode(x, y, data_source=source, dbref_crs=coordinate_system, uuid=last_node_uuid)
-                geo_nodes_in_order.append(geo_node)
-
-                next_edge = _get_next_edge(last_node_uuid, second_last_node_uuid)
-                geo_nodes_in_order.extend(Utils.get_intermediate_geo_nodes_of_geo_edge(container, next_edge, last_node_uuid, self.geo_converter))
-
-                second_last_node_uuid = last_node_uuid
-                last_node_uuid = _get_other_uuid(second_last_node_uuid, next_edge)
-
-            edge.intermediate_geo_nodes = geo_nodes_in_order
+            if last_node_uuid != node_b.geo_node.uuid:
+                raise ValueError(
+                    f"TOP_EDGE {top_kante_uuid} could not be completed, "
+                    f"since the chain of geo edges is broken after {last_node_uuid}."
+                )
+
+            if self.lazy:
+                edge.set_geometry_reader(partial(geo_node_cache.get_intermediate_geo_nodes_of_geo_edge_chain, chain))
+            else:
+                edge.intermediate_geo_nodes = geo_node_cache.get_intermediate_geo_nodes_of_geo_edge_chain(chain)
             self.topology.add_edge(edge)
 
     def read_signals_from_container(self, container):
@@ -129,14 +134,16 @@ class PlanProReader19(object):
                                 0
                             ].ID_TOP_Kante.Wert
                             signal_obj = Signal(
-                                uuid=signal_uuid,
-                                function=function,
-                                kind=signal.Signal_Real.Signal_Real_Aktiv_Schirm.Signal_Art.Wert,
+                                uuid=self.value_pool.intern(signal_uuid),
+                                function=self.value_pool.intern(function, "signal_function"),
+                                kind=self.value_pool.intern(
+                                    signal.Signal_Real.Signal_Real_Aktiv_Schirm.Signal_Art.Wert, "signal_kind"
+                                ),
                                 name=signal.Bezeichnung.Bezeichnung_Aussenanlage.Wert,
                                 edge=self.topology.edges[top_kante_id],
-                                direction=signal.Punkt_Objekt_TOP_Kante[
-                                    0
-                                ].Wirkrichtung.Wert,
+                                direction=self.value_pool.intern(
+                                    signal.Punkt_Objekt_TOP_Kante[0].Wirkrichtung.Wert, "direction"
+                                ),
                                 side_distance=signal.Punkt_Objekt_TOP_Kante[
                                     0
                                 ].Seitlicher_Abstand.Wert,
@@ -1,15 +1,32 @@
 from yaramo.model import Topology
 
-from .planpro19 import PlanProReader19
-from .planpro110 import PlanProReader110
+from .planpro19 import PlanProReader19, parse as parse19
+from .planpro110 import PlanProReader110, parse as parse110
 from .planproversion import PlanProVersion
+from .validator import PlanProValidator, ValidationReport
+from .valuepool import ValuePool
 
 
 def import_planpro(
-    planpro_file: str, planpro_version: PlanProVersion = PlanProReader19, geo_converter=None
+    planpro_file: str, planpro_version: PlanProVersion = PlanProReader19, geo_converter=None, compute_positions=False,
+    value_pool: ValuePool = None, lazy=False,
 ) -> Topology | None:
     if planpro_version == PlanProVersion.PlanPro19:
-        return PlanProReader19(planpro_file, geo_converter).read_topology_from_plan_pro_file()
+        return PlanProReader19(
+            planpro_file, geo_converter, compute_positions, value_pool, lazy
+        ).read_topology_from_plan_pro_file()
     if planpro_version == PlanProVersion.PlanPro110:
-        return PlanProReader110(planpro_file, geo_converter).read_topology_from_plan_pro_file()
+        return PlanProReader110(
+            planpro_file, geo_converter, compute_positions, value_pool, lazy
+        ).read_topology_from_plan_pro_file()
+    return None
+
+
+def validate_planpro(planpro_file: str, planpro_version: PlanProVersion = PlanProVersion.PlanPro19) -> ValidationReport | None:
+    if not planpro_file.endswith(".ppxml"):
+        planpro_file = planpro_file + ".ppxml"
+    if planpro_version == PlanProVersion.PlanPro19:
+        return PlanProValidator(parse19(planpro_file, silence=True), planpro_file, planpro_version).validate()
+    if planpro_version == PlanProVersion.PlanPro110:
+        return PlanProValidator(parse110(planpro_file, silence=True), planpro_file, planpro_version).validate()
     return None
@@ -0,0 +1,138 @@
+import math
+from enum import Enum
+
+from yaramo.model import Edge, Topology
+
+
+class Position:
+
+    def __init__(self, x: float, y: float, heading: float, lateral_offset: float, track_x: float, track_y: float):
+        """The absolute position of a point object.
+
+        :param x: The x coordinate including the lateral offset
+        :param y: The y coordinate including the lateral offset
+        :param heading: The heading in radians (counter-clockwise from the x-axis) in effective direction
+        :param lateral_offset: The lateral offset to the track axis (positive is right of the edge direction A to B)
+        :param track_x: The x coordinate on the track axis
+        :param track_y: The y coordinate on the track axis
+        """
+        self.x = x
+        self.y = y
+        self.heading = heading
+        self.lateral_offset = lateral_offset
+        self.track_x = track_x
+        self.track_y = track_y
+
+    def __repr__(self):
+        return f"Position({self.x}, {self.y}, heading={self.heading})"
+
+
+class PositionCalculator:
+
+    def __init__(self, topology: Topology):
+        """Computes the absolute positions of point objects on the edges of a topology.
+        The point objects are grouped by edge, so the geometry of each edge is prepared
+        only once and all objects of an edge are located in a single sweep.
+
+        :param topology: The topology
+        """
+        self.topology = topology
+        self._polylines: dict[str, tuple] = {}
+
+    def get_polyline(self, edge: Edge):
+        """Gets the coordinates of the geometry of an edge together with the
+        cumulative length at each vertex.
+
+        :param edge: The edge
+        :return: Tuple of x coordinates, y coordinates and cumulative lengths
+        """
+        polyline = self._polylines.get(edge.uuid)
+        if polyline is None:
+            geo_nodes = [edge.node_a.geo_node, *edge.intermediate_geo_nodes, edge.node_b.geo_node]
+            xs, ys, cumulative = [], [], []
+            for geo_node in geo_nodes:
+                if geo_node is None:
+                    continue
+                if xs:
+                    segment_length = math.hypot(geo_node.x - xs[-1], geo_node.y - ys[-1])
+                    if segment_length == 0.0:
+                        continue
+                    cumulative.append(cumulative[-1] + segment_length)
+                else:
+                    cumulative.append(0.0)
+                xs.append(geo_node.x)
+                ys.append(geo_node.y)
+            polyline = (xs, ys, cumulative)
+            self._polylines[edge.uuid] = polyline
+        return polyline
+
+    def locate_on_edge(self, edge: Edge, point_objects) -> dict:
+        """Locates all point objects of one edge.
+
+        :param edge: The edge
+        :param point_objects: Iterable of (uuid, distance, side distance, direction)
+        :return: Dict of uuid to position
+        """
+        xs, ys, cumulative = self.get_polyline(edge)
+        if len(xs) < 2:
+            return {}
+        geo_length = cumulative[-1]
+        scale = geo_length / float(edge.length) if edge.length else 1.0
+        last_segment = len(xs) - 2
+
+        # The point objects are sorted by distance, so the segment only moves forward
+        positions = {}
+        segment = 0
+        for uuid, distance, side_distance, direction in sorted(point_objects, key=lambda p: float(p[1])):
+            geo_distance = min(max(float(distance) * scale, 0.0), geo_length)
+            while segment < last_segment and cumulative[segment + 1] < geo_distance:
+                segment = segment + 1
+            segment_length = cumulative[segment + 1] - cumulative[segment]
+            ux = (xs[segment + 1] - xs[segment]) / segment_length
+            uy = (ys[segment + 1] - ys[segment]) / segment_length
+            t = geo_distance - cumulative[segment]
+            track_x = xs[segment] + ux * t
+            track_y = ys[segment] + uy * t
+
+            side_distance = float(side_distance or 0.0)
+            heading = math.atan2(uy, ux)
+            if direction is not None and str(direction.name if isinstance(direction, Enum) else direction).lower() == "gegen":
+                heading = math.atan2(-uy, -ux)
+            positions[uuid] = Position(
+                track_x + side_distance * uy,
+                track_y - side_distance * ux,
+                heading,
+                side_distance,
+                track_x,
+                track_y,
+            )
+        return positions
+
+    def locate(self, point_objects) -> dict:
+        """Locates point objects on arbitrary edges.
+
+        :param point_objects: Iterable of (uuid, edge, distance, side distance, direction)
+        :return: Dict of uuid to position
+        """
+        by_edge: dict[str, tuple[Edge, list]] = {}
+        for uuid, edge, distance, side_distance, direction in point_objects:
+            by_edge.setdefault(edge.uuid, (edge, []))[1].append((uuid, distance, side_distance, direction))
+
+        positions = {}
+        for edge, edge_point_objects in by_edge.values():
+            positions.update(self.locate_on_edge(edge, edge_point_objects))
+        return positions
+
+    def compute_signal_positions(self) -> dict:
+        """Computes the positions of all signals of the topology and stores them
+        as `position` of each signal.
+
+        :return: Dict of signal uuid to position
+        """
+        positions = self.locate(
+            (signal.uuid, signal.edge, signal.distance_edge, signal.side_distance, signal.direction)
+            for signal in self.topology.signals.values()
+        )
+        for signal_uuid, position in positions.items():
+            self.topology.signals[signal_uuid].position = position
+        return positions
@@ -1,12 +1,16 @@
 from yaramo.model import Route
 
+from .valuepool import ValuePool
+
 
 class RouteReader:
 
     @staticmethod
-    def read_routes_from_container(container, topology):
+    def read_routes_from_container(container, topology, value_pool: ValuePool = None):
+        if value_pool is None:
+            value_pool = ValuePool()
         for fstr_fahrweg in container.Fstr_Fahrweg:
-            fahrweg_uuid = str(fstr_fahrweg.Identitaet.Wert)
+            fahrweg_uuid = value_pool.intern(str(fstr_fahrweg.Identitaet.Wert))
 
             # Maximum speed
             maximum_speed = None
@@ -0,0 +1,350 @@
+import sqlite3
+from contextlib import contextmanager
+from enum import Enum
+
+from yaramo.model import Topology
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS topologies (
+    name TEXT PRIMARY KEY,
+    created_at TEXT,
+    created_with TEXT
+);
+CREATE TABLE IF NOT EXISTS nodes (
+    uuid TEXT PRIMARY KEY,
+    name TEXT,
+    geo_node_uuid TEXT,
+    x REAL,
+    y REAL,
+    crs TEXT,
+    data_source TEXT,
+    drive_amount INTEGER,
+    topology TEXT
+);
+CREATE TABLE IF NOT EXISTS edges (
+    uuid TEXT PRIMARY KEY,
+    node_a TEXT,
+    node_b TEXT,
+    length REAL,
+    geometry_wkt TEXT,
+    topology TEXT
+);
+CREATE TABLE IF NOT EXISTS edge_geometry (
+    edge_uuid TEXT,
+    seq INTEGER,
+    geo_node_uuid TEXT,
+    x REAL,
+    y REAL,
+    PRIMARY KEY (edge_uuid, seq)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS signals (
+    uuid TEXT PRIMARY KEY,
+    name TEXT,
+    function TEXT,
+    kind TEXT,
+    system TEXT,
+    edge_uuid TEXT,
+    direction TEXT,
+    side_distance REAL,
+    distance_edge REAL,
+    topology TEXT
+);
+CREATE TABLE IF NOT EXISTS signal_states (
+    signal_uuid TEXT,
+    state TEXT,
+    PRIMARY KEY (signal_uuid, state)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS tracks (
+    uuid TEXT PRIMARY KEY,
+    track_type TEXT,
+    topology TEXT
+);
+CREATE TABLE IF NOT EXISTS track_sections (
+    track_uuid TEXT,
+    seq INTEGER,
+    edge_uuid TEXT,
+    section_start REAL,
+    section_end REAL,
+    PRIMARY KEY (track_uuid, seq)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS routes (
+    uuid TEXT PRIMARY KEY,
+    name TEXT,
+    start_signal_uuid TEXT,
+    end_signal_uuid TEXT,
+    maximum_speed REAL,
+    topology TEXT
+);
+CREATE TABLE IF NOT EXISTS route_edges (
+    route_uuid TEXT,
+    edge_uuid TEXT,
+    PRIMARY KEY (route_uuid, edge_uuid)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS topology_elements (
+    element_table TEXT,
+    uuid TEXT,
+    topology TEXT,
+    PRIMARY KEY (element_table, uuid, topology)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_topology_elements_topology ON topology_elements (topology, element_table);
+CREATE TABLE IF NOT EXISTS import_failures (
+    topology TEXT PRIMARY KEY,
+    error TEXT
+);
+"""
+
+# Secondary indexes, they are dropped during the export and created again when the exporter is closed
+INDEXES = {
+    "idx_edges_node_a": "edges (node_a)",
+    "idx_edges_node_b": "edges (node_b)",
+    "idx_signals_edge": "signals (edge_uuid)",
+    "idx_signals_name": "signals (name)",
+    "idx_track_sections_edge": "track_sections (edge_uuid)",
+    "idx_routes_start": "routes (start_signal_uuid)",
+    "idx_routes_end": "routes (end_signal_uuid)",
+    "idx_route_edges_edge": "route_edges (edge_uuid)",
+}
+
+# Tables of the elements of a topology, their rows are shared by all topologies containing the element
+ELEMENT_TABLES = ("nodes", "edges", "signals", "tracks", "routes")
+# Tables whose rows belong to the element of another table (child table, key column, parent table)
+DEPENDENT_TABLES = (
+    ("edge_geometry", "edge_uuid", "edges"),
+    ("signal_states", "signal_uuid", "signals"),
+    ("track_sections", "track_uuid", "tracks"),
+    ("route_edges", "route_uuid", "routes"),
+)
+
+
+def _value(value):
+    """Converts enum members to their names and leaves all other values untouched."""
+    if isinstance(value, Enum):
+        return value.name
+    return value
+
+
+class SQLiteExporter:
+
+    def __init__(self, database_file: str, timeout: float = 5.0):
+        """Exports yaramo topologies into a SQLite database. Several topologies can be
+        appended to the same database, elements are deduplicated by their UUID (the first
+        occurrence wins). The table topology_elements records every topology containing
+        an element, so deleting a topology keeps the elements other topologies share.
+        The secondary indexes are dropped before the first export and created again when
+        the exporter is closed, so that all rows are loaded without index maintenance,
+        also when appending to a database that already has the indexes.
+
+        The edge geometry is stored as WKT, so it can be used with SpatiaLite's
+        GeomFromText.
+
+        :param database_file: The SQLite database file
+        :param timeout: Seconds to wait for the lock of another writer of the database
+        """
+        self.database_file = database_file
+        self.connection = sqlite3.connect(database_file, timeout=timeout, isolation_level=None)
+        self.connection.executescript(SCHEMA)
+        self._indexes_dropped = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def export_topology(self, topology: Topology, replace: bool = False):
+        """Exports a topology in a single transaction.
+
+        :param topology: The topology
+        :param replace: Delete the rows of a previous export of a topology with the same name first
+        """
+        name = topology.name
+        created_at = getattr(topology, "created_at", None)
+        nodes = []
+        for node in topology.nodes.values():
+            geo_node = node.geo_node
+            nodes.append((
+                node.uuid,
+                node.name,
+                geo_node.uuid if geo_node is not None else None,
+                geo_node.x if geo_node is not None else None,
+                geo_node.y if geo_node is not None else None,
+                _value(getattr(geo_node, "dbref_crs", None)),
+                getattr(geo_node, "data_source", None),
+                getattr(node, "drive_amount", None),
+                name,
+            ))
+
+        edges = []
+        edge_geometry = []
+        for edge in topology.edges.values():
+            geo_nodes = [edge.node_a.geo_node, *edge.intermediate_geo_nodes, edge.node_b.geo_node]
+            geo_nodes = [geo_node for geo_node in geo_nodes if geo_node is not None]
+            edge_geometry.extend(
+                (edge.uuid, seq, geo_node.uuid, geo_node.x, geo_node.y)
+                for seq, geo_node in enumerate(geo_nodes)
+            )
+            wkt = None
+            if len(geo_nodes) > 1:
+                wkt = "LINESTRING (" + ", ".join(f"{geo_node.x} {geo_node.y}" for geo_node in geo_nodes) + ")"
+            edges.append((edge.uuid, edge.node_a.uuid, edge.node_b.uuid, edge.length, wkt, name))
+
+        signals = []
+        signal_states = []
+        for signal in topology.signals.values():
+            signals.append((
+                signal.uuid,
+                signal.name,
+                _value(signal.function),
+                _value(signal.kind),
+                _value(getattr(signal, "system", None)),
+                signal.edge.uuid,
+                _value(signal.direction),
+                signal.side_distance,
+                signal.distance_edge,
+                name,
+            ))
+            signal_states.extend(
+                (signal.uuid, _value(state)) for state in (getattr(signal, "supported_states", None) or [])
+            )
+
+        tracks = []
+        track_sections = []
+        for track in topology.tracks.values():
+            tracks.append((track.uuid, _value(track.track_type), name))
+            track_sections.extend(
+                (track.uuid, seq, edge.uuid, start, end)
+                for seq, (edge, start, end) in enumerate(track.edges)
+            )
+
+        routes = []
+        route_edges = []
+        for route in topology.routes.values():
+            routes.append((
+                route.uuid,
+                route.name,
+                route.start_signal.uuid,
+                route.end_signal.uuid if route.end_signal is not None else None,
+                route.maximum_speed,
+                name,
+            ))
+            route_edges.extend((route.uuid, edge.uuid) for edge in route.edges)
+
+        topology_elements = [
+            (table, row[0], name)
+            for table, rows in (("nodes", nodes), ("edges", edges), ("signals", signals), ("tracks", tracks), ("routes", routes))
+            for row in rows
+        ]
+
+        with self._transaction() as cursor:
+            if not self._indexes_dropped:
+                for index_name in INDEXES:
+                    cursor.execute(f"DROP INDEX IF EXISTS {index_name}")
+            if replace:
+                self._delete_topology(cursor, name)
+            cursor.execute("DELETE FROM import_failures WHERE topology = ?", (name,))
+            cursor.execute(
+                "INSERT OR IGNORE INTO topologies VALUES (?, ?, ?)",
+                (name, str(created_at) if created_at is not None else None, getattr(topology, "created_with", None)),
+            )
+            cursor.executemany("INSERT OR IGNORE INTO nodes VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", nodes)
+            cursor.executemany("INSERT OR IGNORE INTO edges VALUES (?, ?, ?, ?, ?, ?)", edges)
+            cursor.executemany("INSERT OR IGNORE INTO edge_geometry VALUES (?, ?, ?, ?, ?)", edge_geometry)
+            cursor.executemany("INSERT OR IGNORE INTO signals VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", signals)
+            cursor.executemany("INSERT OR IGNORE INTO signal_states VALUES (?, ?)", signal_states)
+            cursor.executemany("INSERT OR IGNORE INTO tracks VALUES (?, ?, ?)", tracks)
+            cursor.executemany("INSERT OR IGNORE INTO track_sections VALUES (?, ?, ?, ?, ?)", track_sections)
+            cursor.executemany("INSERT OR IGNORE INTO routes VALUES (?, ?, ?, ?, ?, ?)", routes)
+            cursor.executemany("INSERT OR IGNORE INTO route_edges VALUES (?, ?)", route_edges)
+            cursor.executemany("INSERT OR IGNORE INTO topology_elements VALUES (?, ?, ?)", topology_elements)
+        self._indexes_dropped = True
+
+    @contextmanager
+    def _transaction(self):
+        cursor = self.connection.cursor()
+        # Take the write lock right away, so concurrent exporters wait instead of failing later
+        cursor.execute("BEGIN IMMEDIATE")
+        try:
+            yield cursor
+            cursor.execute("COMMIT")
+        except BaseException:
+            cursor.execute("ROLLBACK")
+            raise
+
+    def delete_topology(self, name: str):
+        """Deletes a topology in a single transaction. Elements that are also part of
+        other topologies are kept.
+
+        :param name: The name of the topology
+        """
+        with self._transaction() as cursor:
+            self._delete_topology(cursor, name)
+
+    def record_failure(self, name: str, error: str):
+        """Deletes a topology and records that its import failed, so the database
+        does not keep outdated rows of the topology.
+
+        :param name: The name of the topology
+        :param error: The error of the import
+        """
+        with self._transaction() as cursor:
+            self._delete_topology(cursor, name)
+            cursor.execute("INSERT INTO import_failures VALUES (?, ?)", (name, error))
+
+    @staticmethod
+    def _delete_topology(cursor, name: str):
+        # Hand the shared elements written by the topology over to another topology containing them,
+        # the remaining elements of the topology get no owner and are deleted
+        for table in ELEMENT_TABLES:
+            cursor.execute(
+                f"UPDATE {table} SET topology = ("
+                f"SELECT MIN(e.topology) FROM topology_elements e "
+                f"WHERE e.element_table = '{table}' AND e.uuid = {table}.uuid AND e.topology != ?"
+                f") WHERE topology = ? AND uuid IN ("
+                f"SELECT uuid FROM topology_elements WHERE topology = ? AND element_table = '{table}')",
+                (name, name, name),
+            )
+        for child_table, key, parent_table in DEPENDENT_TABLES:
+            cursor.execute(
+                f"DELETE FROM {child_table} WHERE {key} IN ("
+                f"SELECT p.uuid FROM topology_elements e JOIN {parent_table} p ON p.uuid = e.uuid "
+                f"WHERE e.topology = ? AND e.element_table = '{parent_table}' AND p.topology IS NULL)",
+                (name,),
+            )
+        for table in ELEMENT_TABLES:
+            cursor.execute(
+                f"DELETE FROM {table} WHERE topology IS NULL AND uuid IN ("
+                f"SELECT uuid FROM topology_elements WHERE topology = ? AND element_table = '{table}')",
+                (name,),
+            )
+        cursor.execute("DELETE FROM topology_elements WHERE topology = ?", (name,))
+        cursor.execute("DELETE FROM topologies WHERE name = ?", (name,))
+        cursor.execute("DELETE FROM import_failures WHERE topology = ?", (name,))
+
+    def create_indexes(self):
+        with self._transaction() as cursor:
+            for index_name, definition in INDEXES.items():
+                cursor.execute(f"CREATE INDEX IF NOT EXISTS {index_name} ON {definition}")
+            cursor.execute("ANALYZE")
+        self._indexes_dropped = False
+
+    def close(self, create_indexes: bool = True):
+        """Creates the indexes and closes the database.
+
+        :param create_indexes: Create the indexes, can be skipped if another exporter creates them later
+        """
+        if create_indexes:
+            self.create_indexes()
+        self.connection.close()
+
+
+def export_to_sqlite(topologies, database_file: str):
+    """Exports one or more topologies into a SQLite database.
+
+    :param topologies: A topology or an iterable of topologies
+    :param database_file: The SQLite database file
+    """
+    if isinstance(topologies, Topology):
+        topologies = [topologies]
+    with SQLiteExporter(database_file) as exporter:
+        for topology in topologies:
+            exporter.export_topology(topology)
@@ -11,6 +11,15 @@ class Utils:
         :return: The coordinates (x, y)
         """
         geo_point = Utils.get_geo_point_by_geo_node_uuid(container, uuid)
+        return Utils.get_coordinates_of_geo_point(geo_point)
+
+    @staticmethod
+    def get_coordinates_of_geo_point(geo_point):
+        """Gets the coordinates of a geo point.
+
+        :param geo_point: The geo point or None
+        :return: The coordinates (x, y, source, coordinate system)
+        """
         if geo_point is None:
             return None, None, None, None
         x = float(geo_point.GEO_Punkt_Allg.GK_X.Wert)
@@ -76,13 +85,17 @@ class Utils:
             cur_node.set_connection_head_edge(edge)
 
     @staticmethod
-    def get_intermediate_geo_nodes_of_geo_edge(container, edge, last_node_uuid, geo_converter):
+    def get_intermediate_geo_nodes_of_geo_edge(container, edge, last_node_uuid, geo_converter, geo_node_cache=None):
         if geo_converter is not None:
-            geo_point_a = Utils.get_geo_point_by_geo_node_uuid(container, edge.ID_GEO_Knoten_A.Wert)
-            geo_point_b = Utils.get_geo_point_by_geo_node_uuid(container, edge.ID_GEO_Knoten_B.Wert)
-            inter_geo_nodes = geo_converter.get_intermediate_geo_nodes_of_geo_edge(edge, geo_point_a, geo_point_b)
-            x, y, source, coordinate_system = Utils.get_coordinates_of_geo_node(container, last_node_uuid)
-            last_geo_node = DbrefGeoNode(x, y, data_source=source, dbref_crs=coordinate_system)
+            if geo_node_cache is not None:
+                inter_geo_nodes = geo_node_cache.get_intermediate_geo_nodes(edge)
+                last_geo_node = geo_node_cache.get_geo_node(last_node_uuid)
+            else:
+                geo_point_a = Utils.get_geo_point_by_geo_node_uuid(container, edge.ID_GEO_Knoten_A.Wert)
+                geo_point_b = Utils.get_geo_point_by_geo_node_uuid(container, edge.ID_GEO_Knoten_B.Wert)
+                inter_geo_nodes = geo_converter.get_intermediate_geo_nodes_of_geo_edge(edge, geo_point_a, geo_point_b)
+                x, y, source, coordinate_system = Utils.get_coordinates_of_geo_node(container, last_node_uuid)
+                last_geo_node = DbrefGeoNode(x, y, data_source=source, dbref_crs=coordinate_system)
 
             if len(inter_geo_nodes) <= 1:
                 return inter_geo_nodes
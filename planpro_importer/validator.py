@@ -0,0 +1,407 @@
+import time
+from enum import Enum
+
+from yaramo.model import SignalFunction
+
+from .planpro110.signalreader import SignalReader
+from .planproversion import PlanProVersion
+from .utils import Utils
+
+PLANPRO19_SIGNAL_FUNCTIONS = ("Einfahr_Signal", "Ausfahr_Signal", "Block_Signal")
+
+
+class ValidationErrorCode(Enum):
+    MissingGeoPoint = "missing_geo_point"
+    MissingTopNode = "missing_top_node"
+    BrokenGeoChain = "broken_geo_chain"
+    UnknownSignalEdge = "unknown_signal_edge"
+    SignalWithoutIdentifier = "signal_without_identifier"
+    UnsupportedSignalFunction = "unsupported_signal_function"
+    UnknownRouteSignal = "unknown_route_signal"
+    UnknownPointEdge = "unknown_point_edge"
+    InconsistentPointNodes = "inconsistent_point_nodes"
+    MissingPointComponent = "missing_point_component"
+    UnresolvedPointDrive = "unresolved_point_drive"
+    UnknownTrackEdge = "unknown_track_edge"
+
+
+class ValidationIssue:
+
+    def __init__(self, code: ValidationErrorCode, uuid: str, message: str, related_uuid: str = None):
+        """A single referential integrity error of a PlanPro file.
+
+        :param code: The error code
+        :param uuid: The uuid of the affected element
+        :param message: A human readable description
+        :param related_uuid: The uuid of the referenced element (optional)
+        """
+        self.code = code
+        self.uuid = uuid
+        self.message = message
+        self.related_uuid = related_uuid
+
+    def to_dict(self):
+        return {
+            "code": self.code.value,
+            "uuid": self.uuid,
+            "related_uuid": self.related_uuid,
+            "message": self.message,
+        }
+
+    def __repr__(self):
+        return f"ValidationIssue({self.code.value}, {self.uuid})"
+
+
+class ValidationReport:
+
+    def __init__(self, file_name: str = None):
+        """The result of a validation run.
+
+        :param file_name: The name of the validated file (optional)
+        """
+        self.file_name = file_name
+        self.issues: list[ValidationIssue] = []
+        self.duration: float = 0.0
+
+    @property
+    def is_valid(self) -> bool:
+        return not self.issues
+
+    def add_issue(self, code: ValidationErrorCode, uuid: str, message: str, related_uuid: str = None):
+        self.issues.append(ValidationIssue(code, uuid, message, related_uuid))
+
+    def get_issues_by_code(self, code: ValidationErrorCode) -> list[ValidationIssue]:
+        return [issue for issue in self.issues if issue.code == code]
+
+    def to_dict(self):
+        counts = {}
+        for issue in self.issues:
+            counts[issue.code.value] = counts.get(issue.code.value, 0) + 1
+        return {
+            "file": self.file_name,
+            "valid": self.is_valid,
+            "duration": self.duration,
+            "counts": counts,
+            "issues": [issue.to_dict() for issue in self.issues],
+        }
+
+
+class PlanProValidator:
+
+    def __init__(self, root_object, file_name: str = None, planpro_version: PlanProVersion = PlanProVersion.PlanPro19):
+        """The validator checks the references between the elements of a parsed
+        PlanPro file that are needed for a clean import. It only builds UUID indexes
+        and does not create any yaramo objects. Signals are accepted by the same rules
+        as the reader of the given PlanPro version.
+
+        Checked are the references the readers follow without a guard: the geo points
+        of the TOP_Knoten, the TOP_Knoten and the geo edge chains of the TOP_Kanten, the
+        TOP_Kanten of signals and the signals of routes. For PlanPro 1.10 also the points
+        of the point components and elements and the TOP_Kanten of tracks are checked.
+        Other content, e.g. missing mandatory attributes, is not validated.
+
+        :param root_object: The parsed PlanPro root object
+        :param file_name: The name of the file (optional)
+        :param planpro_version: The PlanPro version of the file
+        """
+        self.root_object = root_object
+        self.file_name = file_name
+        self.planpro_version = planpro_version
+        self.nodes: dict[str, object] = {}
+        self.edges: dict[str, object] = {}
+        self.signals: set[str] = set()
+
+    def validate(self) -> ValidationReport:
+        """Validates all containers of the PlanPro file.
+
+        :return: The validation report
+        """
+        start = time.perf_counter()
+        report = ValidationReport(self.file_name)
+        container = Utils.get_container(self.root_object)
+
+        for _container in container:
+            self.validate_nodes(_container, report)
+        for _container in container:
+            self.validate_edges(_container, report)
+        if self.planpro_version == PlanProVersion.PlanPro110:
+            # Only the PlanPro 1.10 reader reads points and tracks
+            for _container in container:
+                self.validate_points(_container, report)
+            for _container in container:
+                self.validate_tracks(_container, report)
+        for _container in container:
+            self.validate_signals(_container, report)
+        for _container in container:
+            self.validate_routes(_container, report)
+
+        report.duration = time.perf_counter() - start
+        return report
+
+    def validate_nodes(self, container, report: ValidationReport):
+        # The readers resolve geo points only within the container of the TOP_Knoten
+        geo_nodes = set()
+        for geo_point in container.GEO_Punkt:
+            if geo_point.ID_GEO_Knoten is not None:
+                geo_nodes.add(geo_point.ID_GEO_Knoten.Wert)
+
+        for top_knoten in container.TOP_Knoten:
+            top_knoten_uuid = top_knoten.Identitaet.Wert
+            geo_node_uuid = top_knoten.ID_GEO_Knoten.Wert
+            if geo_node_uuid not in geo_nodes:
+                report.add_issue(
+                    ValidationErrorCode.MissingGeoPoint,
+                    top_knoten_uuid,
+                    f"No GEO_Punkt found for GEO_Knoten {geo_node_uuid} of TOP_Knoten {top_knoten_uuid}",
+                    geo_node_uuid,
+                )
+                continue
+            self.nodes[top_knoten_uuid] = geo_node_uuid
+
+    def validate_edges(self, container, report: ValidationReport):
+        geo_edges_by_top_edge = {}
+        for geo_edge in container.GEO_Kante:
+            geo_edges_by_top_edge.setdefault(geo_edge.ID_GEO_Art.Wert, []).append(geo_edge)
+
+        for top_kante in container.TOP_Kante:
+            top_kante_uuid = top_kante.Identitaet.Wert
+            node_uuids = [top_kante.ID_TOP_Knoten_A.Wert, top_kante.ID_TOP_Knoten_B.Wert]
+            missing_nodes = [node_uuid for node_uuid in node_uuids if node_uuid not in self.nodes]
+            for node_uuid in missing_nodes:
+                report.add_issue(
+                    ValidationErrorCode.MissingTopNode,
+                    top_kante_uuid,
+                    f"TOP_Knoten {node_uuid} of TOP_Kante {top_kante_uuid} not found",
+                    node_uuid,
+                )
+            if missing_nodes:
+                continue
+
+            geo_edges = geo_edges_by_top_edge.get(top_kante_uuid, [])
+            broken_after = self.get_end_of_broken_geo_chain(
+                geo_edges, self.nodes[node_uuids[0]], self.nodes[node_uuids[1]]
+            )
+            if broken_after is not None:
+                report.add_issue(
+                    ValidationErrorCode.BrokenGeoChain,
+                    top_kante_uuid,
+                    f"Chain of geo edges of TOP_Kante {top_kante_uuid} is broken after {broken_after}",
+                    broken_after,
+                )
+                continue
+            self.edges[top_kante_uuid] = top_kante
+
+    @staticmethod
+    def get_end_of_broken_geo_chain(geo_edges, geo_node_a_uuid: str, geo_node_b_uuid: str):
+        """Follows the chain of geo edges from the geo node of TOP_Knoten A to the one
+        of TOP_Knoten B the same way the readers do.
+
+        :param geo_edges: The geo edges of the TOP_Kante
+        :param geo_node_a_uuid: The uuid of the geo node of TOP_Knoten A
+        :param geo_node_b_uuid: The uuid of the geo node of TOP_Knoten B
+        :return: None if the chain is complete, else the uuid of the last reached geo node
+        """
+        ends = [(geo_edge.ID_GEO_Knoten_A.Wert, geo_edge.ID_GEO_Knoten_B.Wert) for geo_edge in geo_edges]
+
+        def _get_next_ends(_previous_node_uuid, _second_previous_node_uuid):
+            for _ends in ends:
+                if _previous_node_uuid in _ends and _second_previous_node_uuid not in _ends:
+                    return _ends
+            return None
+
+        second_previous_node_uuid = None
+        previous_node_uuid = geo_node_a_uuid
+        visited = set()
+        while previous_node_uuid != geo_node_b_uuid:
+            if previous_node_uuid in visited:
+                return previous_node_uuid
+            visited.add(previous_node_uuid)
+            next_ends = _get_next_ends(previous_node_uuid, second_previous_node_uuid)
+            if next_ends is None:
+                return previous_node_uuid
+            second_previous_node_uuid = previous_node_uuid
+            previous_node_uuid = next_ends[1] if next_ends[0] == previous_node_uuid else next_ends[0]
+        return None
+
+    def validate_points(self, container, report: ValidationReport):
+        # The reader finds the points through the TOP_Kanten of the same container
+        top_edges = {top_kante.Identitaet.Wert: top_kante for top_kante in container.TOP_Kante}
+        points = {}
+        first_component_by_element = {}
+        for component in container.W_Kr_Gsp_Komponente:
+            component_uuid = component.Identitaet.Wert
+            points[component_uuid] = self.get_point_of_component(component, top_edges, report)
+            first_component_by_element.setdefault(component.ID_W_Kr_Gsp_Element.Wert, component_uuid)
+
+        for element in container.W_Kr_Gsp_Element:
+            element_uuid = element.Identitaet.Wert
+            if element_uuid not in first_component_by_element:
+                report.add_issue(
+                    ValidationErrorCode.MissingPointComponent,
+                    element_uuid,
+                    f"No W_Kr_Gsp_Komponente found for point element {element_uuid}",
+                )
+
+        for component in container.W_Kr_Gsp_Komponente:
+            if component.Zungenpaar is None:
+                continue
+            component_uuid = component.Identitaet.Wert
+            element_uuid = component.ID_W_Kr_Gsp_Element.Wert
+            # The reader sets the drive amount on the point of the first component of the element
+            if points[first_component_by_element[element_uuid]] is None:
+                report.add_issue(
+                    ValidationErrorCode.UnresolvedPointDrive,
+                    component_uuid,
+                    f"No point found for the drives of point component {component_uuid}",
+                    element_uuid,
+                )
+
+    def get_point_of_component(self, component, top_edges: dict, report: ValidationReport):
+        """Gets the uuid of the point, the TOP_Knoten, of a component the same way the
+        PlanPro 1.10 reader does.
+
+        :param component: The point component
+        :param top_edges: The TOP_Kanten of the container by their uuid
+        :param report: The validation report
+        :return: The uuid of the TOP_Knoten or None
+        """
+        component_uuid = component.Identitaet.Wert
+        point_uuid = None
+        for top_edge_xml in component.Punkt_Objekt_TOP_Kante:
+            top_edge_uuid = top_edge_xml.ID_TOP_Kante.Wert
+            top_kante = top_edges.get(top_edge_uuid)
+            if top_kante is None:
+                report.add_issue(
+                    ValidationErrorCode.UnknownPointEdge,
+                    component_uuid,
+                    f"TOP_Kante {top_edge_uuid} of point component {component_uuid} not found",
+                    top_edge_uuid,
+                )
+                return None
+            distance = float(top_edge_xml.Abstand.Wert)
+            if distance == 0.0:
+                node_uuid = top_kante.ID_TOP_Knoten_A.Wert
+            elif float(top_kante.TOP_Kante_Allg.TOP_Laenge.Wert) == distance:
+                node_uuid = top_kante.ID_TOP_Knoten_B.Wert
+            else:
+                # Lock-objects are placed within the edge. Ignore these.
+                return None
+
+            if point_uuid is None:
+                point_uuid = node_uuid
+            elif point_uuid != node_uuid:
+                report.add_issue(
+                    ValidationErrorCode.InconsistentPointNodes,
+                    component_uuid,
+                    f"Point component {component_uuid} points to different TOP_Knoten "
+                    f"({point_uuid} and {node_uuid})",
+                    node_uuid,
+                )
+                return None
+        if point_uuid not in self.nodes:
+            return None
+        return point_uuid
+
+    def validate_tracks(self, container, report: ValidationReport):
+        for track in container.Gleis_Art:
+            track_uuid = track.Identitaet.Wert
+            for section in track.Bereich_Objekt_Teilbereich:
+                top_kante_uuid = section.ID_TOP_Kante.Wert
+                if top_kante_uuid not in self.edges:
+                    report.add_issue(
+                        ValidationErrorCode.UnknownTrackEdge,
+                        track_uuid,
+                        f"TOP_Kante {top_kante_uuid} of track {track_uuid} not found",
+                        top_kante_uuid,
+                    )
+
+    def validate_signals(self, container, report: ValidationReport):
+        if self.planpro_version == PlanProVersion.PlanPro19:
+            signals = self.get_accepted_signals_19(container)
+        else:
+            signals = self.get_accepted_signals_110(container, report)
+
+        for signal in signals:
+            signal_uuid = signal.Identitaet.Wert
+            if not signal.Punkt_Objekt_TOP_Kante:
+                report.add_issue(
+                    ValidationErrorCode.UnknownSignalEdge,
+                    signal_uuid,
+                    f"Signal {signal_uuid} is not placed on any TOP_Kante",
+                )
+                continue
+            top_kante_uuid = signal.Punkt_Objekt_TOP_Kante[0].ID_TOP_Kante.Wert
+            if top_kante_uuid not in self.edges:
+                report.add_issue(
+                    ValidationErrorCode.UnknownSignalEdge,
+                    signal_uuid,
+                    f"TOP_Kante {top_kante_uuid} of signal {signal_uuid} not found",
+                    top_kante_uuid,
+                )
+                continue
+            self.signals.add(signal_uuid)
+
+    @staticmethod
+    def get_accepted_signals_19(container):
+        """Gets the signals the PlanPro 1.9 reader imports: real, active main signals
+        with exactly one TOP_Kante and an identifier. All others are skipped by the
+        reader on purpose, so they are no errors.
+
+        :param container: The container
+        :return: The accepted signals
+        """
+        signals = []
+        for signal in container.Signal:
+            if signal.Signal_Real is None or signal.Signal_Real.Signal_Real_Aktiv is None:
+                continue
+            if len(signal.Punkt_Objekt_TOP_Kante) != 1:
+                continue
+            if signal.Bezeichnung is None or signal.Bezeichnung.Bezeichnung_Aussenanlage is None:
+                continue
+            if signal.Signal_Real.Signal_Real_Aktiv.Signal_Funktion.Wert not in PLANPRO19_SIGNAL_FUNCTIONS:
+                continue
+            signals.append(signal)
+        return signals
+
+    @staticmethod
+    def get_accepted_signals_110(container, report: ValidationReport):
+        """Gets the signals the PlanPro 1.10 reader imports and reports the signals
+        it rejects.
+
+        :param container: The container
+        :param report: The validation report
+        :return: The accepted signals
+        """
+        signal_reader = SignalReader(None, container)
+        signals = []
+        for signal in container.Signal:
+            signal_uuid = signal.Identitaet.Wert
+            if signal_reader.get_signal_identifier(signal) is None:
+                report.add_issue(
+                    ValidationErrorCode.SignalWithoutIdentifier,
+                    signal_uuid,
+                    f"Signal {signal_uuid} has no identifier",
+                )
+                continue
+            function = signal_reader.get_signal_function(signal)
+            if function not in SignalFunction.__members__:
+                report.add_issue(
+                    ValidationErrorCode.UnsupportedSignalFunction,
+                    signal_uuid,
+                    f"Signal function {function} of signal {signal_uuid} is not supported",
+                )
+                continue
+            signals.append(signal)
+        return signals
+
+    def validate_routes(self, container, report: ValidationReport):
+        for fstr_fahrweg in container.Fstr_Fahrweg:
+            fahrweg_uuid = fstr_fahrweg.Identitaet.Wert
+            for kind, signal_uuid in (("start", fstr_fahrweg.ID_Start.Wert), ("target", fstr_fahrweg.ID_Ziel.Wert)):
+                if signal_uuid not in self.signals:
+                    report.add_issue(
+                        ValidationErrorCode.UnknownRouteSignal,
+                        fahrweg_uuid,
+                        f"The {kind} signal {signal_uuid} of route {fahrweg_uuid} not found or not imported",
+                        signal_uuid,
+                    )
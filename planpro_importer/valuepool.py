@@ -0,0 +1,56 @@
+import sys
+import threading
+
+
+class ValuePool:
+
+    def __init__(self):
+        """The value pool deduplicates repeated values (UUIDs, coordinate systems, sources,
+        signal functions, ...) of an import. Every equal value is stored only once and
+        shared by all elements referring to it. The pool can be shared between several
+        imports, also in several threads.
+        """
+        self._values: dict = {}
+        self._statistics: dict[str, list[int]] = {}
+        self._lock = threading.Lock()
+
+    def intern(self, value, category: str = "uuid"):
+        """Gets the pooled instance of a value.
+
+        :param value: The value (must be hashable), None is returned unchanged
+        :param category: The category of the value for the memory report
+        :return: The pooled value
+        """
+        if value is None:
+            return None
+        with self._lock:
+            pooled = self._values.setdefault(value, value)
+            statistics = self._statistics.get(category)
+            if statistics is None:
+                statistics = self._statistics.setdefault(category, [0, 0, 0])
+            statistics[0] += 1
+            if pooled is not value:
+                statistics[1] += 1
+                statistics[2] += sys.getsizeof(value)
+        return pooled
+
+    def __len__(self):
+        return len(self._values)
+
+    def memory_report(self) -> dict:
+        """Gets the number of lookups, the number of replaced duplicates and the
+        memory saved by the replaced duplicates (in bytes) for each category.
+
+        :return: The memory report
+        """
+        with self._lock:
+            report = {
+                category: {"lookups": lookups, "duplicates": duplicates, "saved_bytes": saved_bytes}
+                for category, (lookups, duplicates, saved_bytes) in self._statistics.items()
+            }
+            report["total"] = {
+                "unique_values": len(self._values),
+                "pooled_bytes": sum(sys.getsizeof(value) for value in self._values),
+                "saved_bytes": sum(statistics[2] for statistics in self._statistics.values()),
+            }
+        return report
@@ -0,0 +1,96 @@
+import io
+import os
+
+import pytest
+
+pytest.importorskip("yaramo")
+cli = pytest.importorskip("planpro_importer.cli")
+
+
+@pytest.fixture
+def store_file(tmp_path):
+    return str(tmp_path / "fingerprints.json")
+
+
+@pytest.fixture
+def planpro_file(tmp_path):
+    planpro_file = tmp_path / "station.ppxml"
+    planpro_file.write_text("first")
+    return str(planpro_file)
+
+
+def _set_mtime(file_name, mtime_ns):
+    os.utime(file_name, ns=(mtime_ns, mtime_ns))
+
+
+def test_new_and_unchanged_files(store_file, planpro_file):
+    store = cli.FingerprintStore(store_file)
+    assert store.has_changed(planpro_file)
+    store.update(planpro_file)
+    assert not store.has_changed(planpro_file)
+
+    store.save()
+    assert not cli.FingerprintStore(store_file).has_changed(planpro_file)
+
+
+def test_touched_file_with_same_content(store_file, planpro_file):
+    store = cli.FingerprintStore(store_file)
+    store.has_changed(planpro_file)
+    store.update(planpro_file)
+
+    _set_mtime(planpro_file, os.stat(planpro_file).st_mtime_ns + 10**9)
+    assert not store.has_changed(planpro_file)
+    assert store.fingerprints[planpro_file]["mtime_ns"] == os.stat(planpro_file).st_mtime_ns
+
+
+def test_change_during_import_is_detected(store_file, planpro_file):
+    store = cli.FingerprintStore(store_file)
+    assert store.has_changed(planpro_file)
+
+    # The file changes after the check, but before the fingerprint is stored
+    mtime_ns = os.stat(planpro_file).st_mtime_ns
+    with open(planpro_file, "w") as f:
+        f.write("second")
+    _set_mtime(planpro_file, mtime_ns + 10**9)
+    store.update(planpro_file)
+
+    assert store.has_changed(planpro_file)
+
+
+def test_missing_file_is_skipped(store_file, tmp_path):
+    store = cli.FingerprintStore(store_file)
+    assert not store.has_changed(str(tmp_path / "missing.ppxml"))
+
+
+def test_retain_removes_fingerprints_of_deleted_files(store_file, planpro_file):
+    store = cli.FingerprintStore(store_file)
+    store.has_changed(planpro_file)
+    store.update(planpro_file)
+
+    assert store.retain([planpro_file]) == []
+    assert store.retain([]) == [planpro_file]
+    assert store.fingerprints == {}
+
+
+def test_topology_name_is_relative_path(tmp_path):
+    file_name = str(tmp_path / "north" / "station.ppxml")
+    assert cli.get_topology_name(file_name, str(tmp_path)) == "north/station"
+
+
+def test_validation_summary():
+    results = [
+        {"file": "a.ppxml", "ok": True, "valid": True, "issues": [], "seconds": 0.5},
+        {
+            "file": "b.ppxml",
+            "ok": False,
+            "valid": False,
+            "issues": [{"code": "missing_top_node", "message": "TOP_Knoten not found"}],
+            "seconds": 0.25,
+        },
+        {"file": "c.ppxml", "ok": False, "error": "ValueError: broken", "seconds": 0.25},
+    ]
+    out = io.StringIO()
+    cli.print_results(results, "summary", out, validation=True)
+
+    total = out.getvalue().splitlines()[-1]
+    assert total == "Total: 3 file(s), 1 valid, 1 invalid, 1 failed, 1 issue(s) (1.000s)"
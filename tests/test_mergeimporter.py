@@ -0,0 +1,66 @@
+import pytest
+
+yaramo_model = pytest.importorskip("yaramo.model")
+mergeimporter = pytest.importorskip("planpro_importer.mergeimporter")
+
+
+def _get_topology(name, edges):
+    """A topology of the given edges, each given as (uuid, node a, slot at a, node b, slot at b)."""
+    topology = yaramo_model.Topology(name=name)
+    for edge_uuid, node_a_uuid, slot_a, node_b_uuid, slot_b in edges:
+        nodes = []
+        for node_uuid in (node_a_uuid, node_b_uuid):
+            if node_uuid not in topology.nodes:
+                node = yaramo_model.Node(uuid=node_uuid)
+                node.geo_node = yaramo_model.DbrefGeoNode(0.0, 0.0)
+                topology.add_node(node)
+            nodes.append(topology.nodes[node_uuid])
+        edge = yaramo_model.Edge(nodes[0], nodes[1], length=100.0, uuid=edge_uuid)
+        getattr(nodes[0], f"set_connection_{slot_a}_edge")(edge)
+        getattr(nodes[1], f"set_connection_{slot_b}_edge")(edge)
+        topology.add_edge(edge)
+    return topology
+
+
+def _merge(*topologies):
+    merger = mergeimporter.TopologyMerger()
+    for topology in topologies:
+        merger.add_topology(topology)
+    return merger.topology, merger.report
+
+
+def test_files_meeting_at_boundary_node():
+    topology, report = _merge(
+        _get_topology("a", [("E1", "N1", "head", "S", "head")]),
+        _get_topology("b", [("E2", "S", "head", "N2", "head")]),
+    )
+
+    assert report.conflicts == []
+    assert report.duplicates["node"] == 1
+    boundary = topology.nodes["S"]
+    assert boundary.connected_on_head is topology.edges["E1"]
+    assert boundary.connected_on_left is topology.edges["E2"]
+    assert topology.edges["E2"].node_a is boundary
+
+
+def test_point_connection_replaces_boundary_edge():
+    topology, report = _merge(
+        _get_topology("a", [("E1", "N1", "head", "S", "head")]),
+        _get_topology("b", [("E2", "S", "head", "N2", "head")]),
+        _get_topology("c", [("E3", "S", "left", "N3", "head")]),
+    )
+
+    assert report.conflicts == []
+    boundary = topology.nodes["S"]
+    assert boundary.connected_on_left is topology.edges["E3"]
+    assert boundary.connected_on_right is topology.edges["E2"]
+
+
+def test_clash_of_point_connections():
+    topology, report = _merge(
+        _get_topology("a", [("E1", "P", "left", "N1", "head")]),
+        _get_topology("b", [("E2", "P", "left", "N2", "head")]),
+    )
+
+    assert [(conflict.kind, conflict.uuid) for conflict in report.conflicts] == [("node", "P")]
+    assert topology.nodes["P"].connected_on_left is topology.edges["E1"]
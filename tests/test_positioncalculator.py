@@ -0,0 +1,61 @@
+import math
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("yaramo")
+PositionCalculator = pytest.importorskip("planpro_importer.positioncalculator").PositionCalculator
+
+
+def _get_edge(coordinates, length):
+    """An edge with the given geometry, the first and the last coordinate are the nodes."""
+    geo_nodes = [SimpleNamespace(x=x, y=y) for x, y in coordinates]
+    return SimpleNamespace(
+        uuid="edge",
+        length=length,
+        node_a=SimpleNamespace(geo_node=geo_nodes[0]),
+        node_b=SimpleNamespace(geo_node=geo_nodes[-1]),
+        intermediate_geo_nodes=geo_nodes[1:-1],
+    )
+
+
+def test_lateral_offset_is_right_of_edge_direction():
+    edge = _get_edge([(0.0, 0.0), (100.0, 0.0)], 100.0)
+
+    position = PositionCalculator(None).locate_on_edge(edge, [("object", 25.0, 3.0, "in")])["object"]
+
+    assert (position.track_x, position.track_y) == (25.0, 0.0)
+    assert (position.x, position.y) == (25.0, -3.0)
+    assert position.lateral_offset == 3.0
+    assert position.heading == 0.0
+
+
+def test_heading_against_edge_direction():
+    edge = _get_edge([(0.0, 0.0), (0.0, 100.0)], 100.0)
+
+    positions = PositionCalculator(None).locate_on_edge(
+        edge, [("in", 50.0, 0.0, "in"), ("gegen", 50.0, 0.0, "gegen")]
+    )
+
+    assert positions["in"].heading == pytest.approx(math.pi / 2)
+    assert positions["gegen"].heading == pytest.approx(-math.pi / 2)
+
+
+def test_distance_is_scaled_to_geometry_and_follows_segments():
+    # The geometry is 100 long, the topological length is 200
+    edge = _get_edge([(0.0, 0.0), (50.0, 0.0), (50.0, 50.0)], 200.0)
+
+    positions = PositionCalculator(None).locate_on_edge(edge, [("first", 50.0, 0.0, None), ("second", 150.0, 0.0, None)])
+
+    assert (positions["first"].x, positions["first"].y) == pytest.approx((25.0, 0.0))
+    assert (positions["second"].x, positions["second"].y) == pytest.approx((50.0, 25.0))
+    assert positions["second"].heading == pytest.approx(math.pi / 2)
+
+
+def test_distance_is_clamped_to_edge():
+    edge = _get_edge([(0.0, 0.0), (100.0, 0.0)], 100.0)
+
+    positions = PositionCalculator(None).locate_on_edge(edge, [("before", -10.0, 0.0, None), ("after", 120.0, 0.0, None)])
+
+    assert (positions["before"].x, positions["before"].y) == (0.0, 0.0)
+    assert (positions["after"].x, positions["after"].y) == (100.0, 0.0)
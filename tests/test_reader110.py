@@ -0,0 +1,137 @@
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("yaramo")
+reader110 = pytest.importorskip("planpro_importer.planpro110.reader110")
+
+
+def _value(value):
+    return SimpleNamespace(Wert=value)
+
+
+def _geo_point(uuid, x, y):
+    return SimpleNamespace(
+        ID_GEO_Knoten=_value(uuid),
+        GEO_Punkt_Allg=SimpleNamespace(
+            GK_X=_value(x), GK_Y=_value(y), Plan_Quelle=_value("test"), GEO_Koordinatensystem=_value("DR0")
+        ),
+    )
+
+
+def _geo_edge(uuid, geo_node_a, geo_node_b):
+    return SimpleNamespace(
+        Identitaet=_value(uuid),
+        ID_GEO_Art=_value("edge"),
+        ID_GEO_Knoten_A=_value(geo_node_a),
+        ID_GEO_Knoten_B=_value(geo_node_b),
+    )
+
+
+def _get_container():
+    """A single edge from a point (node_a) to a buffer stop (node_b). The point
+    has one component with a Zungenpaar at the start of the edge, a lock is
+    placed within the edge."""
+    return SimpleNamespace(
+        TOP_Knoten=[
+            SimpleNamespace(Identitaet=_value("node_a"), ID_GEO_Knoten=_value("geo_a")),
+            SimpleNamespace(Identitaet=_value("node_b"), ID_GEO_Knoten=_value("geo_b")),
+        ],
+        GEO_Punkt=[_geo_point("geo_a", 0.0, 0.0), _geo_point("geo_m", 50.0, 0.0), _geo_point("geo_b", 100.0, 0.0)],
+        GEO_Kante=[_geo_edge("geo_edge_1", "geo_a", "geo_m"), _geo_edge("geo_edge_2", "geo_m", "geo_b")],
+        TOP_Kante=[
+            SimpleNamespace(
+                Identitaet=_value("edge"),
+                ID_TOP_Knoten_A=_value("node_a"),
+                ID_TOP_Knoten_B=_value("node_b"),
+                TOP_Kante_Allg=SimpleNamespace(
+                    TOP_Laenge=_value("100"), TOP_Anschluss_A=_value("Spitze"), TOP_Anschluss_B=_value("Ende")
+                ),
+            )
+        ],
+        W_Kr_Gsp_Element=[
+            SimpleNamespace(
+                Identitaet=_value("element"),
+                Bezeichnung=SimpleNamespace(Bezeichnung_Aussenanlage=_value("W1")),
+            )
+        ],
+        W_Kr_Gsp_Komponente=[
+            SimpleNamespace(
+                Identitaet=_value("component"),
+                ID_W_Kr_Gsp_Element=_value("element"),
+                Zungenpaar=SimpleNamespace(Elektrischer_Antrieb_Anzahl=_value(2)),
+                Punkt_Objekt_TOP_Kante=[
+                    SimpleNamespace(
+                        ID_TOP_Kante=_value("edge"), Abstand=_value("0"), Seitlicher_Abstand=None, Wirkrichtung=None
+                    )
+                ],
+            ),
+            SimpleNamespace(
+                Identitaet=_value("lock"),
+                ID_W_Kr_Gsp_Element=_value("lock_element"),
+                Zungenpaar=None,
+                Punkt_Objekt_TOP_Kante=[
+                    SimpleNamespace(
+                        ID_TOP_Kante=_value("edge"),
+                        Abstand=_value("30"),
+                        Seitlicher_Abstand=_value(2.0),
+                        Wirkrichtung=_value("gegen"),
+                    )
+                ],
+            ),
+        ],
+        Signal=[],
+        Signal_Rahmen=[],
+        Signal_Signalbegriff=[],
+        Fstr_Fahrweg=[],
+        Gleis_Art=[],
+    )
+
+
+@pytest.fixture
+def planpro_file(monkeypatch):
+    root_object = SimpleNamespace(
+        PlanPro_Schnittstelle_Allg=SimpleNamespace(
+            Erzeugung_Zeitstempel=_value("2024-01-01T00:00:00"),
+            Werkzeug_Name=_value("test"),
+            Werkzeug_Version=_value("1.0"),
+        ),
+        LST_Planung=None,
+        LST_Zustand=SimpleNamespace(Container=_get_container()),
+    )
+    monkeypatch.setattr(reader110, "parse", lambda *args, **kwargs: root_object)
+    return "station.ppxml"
+
+
+@pytest.mark.parametrize("lazy", [False, True])
+def test_point_names_and_drive_amounts(planpro_file, lazy):
+    topology = reader110.PlanProReader110(planpro_file, lazy=lazy).read_topology_from_plan_pro_file()
+
+    assert list(topology.edges) == ["edge"]
+    point = topology.nodes["node_a"]
+    assert point.name == "W1"
+    assert point.drive_amount == 2
+    assert topology.nodes["node_b"].name == "node_b"[-5:]
+
+
+def test_lazy_nodes_are_complete_without_edges(planpro_file):
+    topology = reader110.PlanProReader110(planpro_file, lazy=True).read_topology_from_plan_pro_file()
+
+    point = topology.nodes["node_a"]
+    assert point.name == "W1"
+    assert point.drive_amount == 2
+    assert topology.nodes["node_b"].name == "node_b"[-5:]
+    assert not topology.is_materialised("edges")
+
+
+@pytest.mark.parametrize("lazy", [False, True])
+def test_point_component_positions(planpro_file, lazy):
+    topology = reader110.PlanProReader110(
+        planpro_file, compute_positions=True, lazy=lazy
+    ).read_topology_from_plan_pro_file()
+
+    positions = topology.point_positions
+    assert set(positions) == {"component", "lock"}
+    assert (positions["component"].x, positions["component"].y) == (0.0, 0.0)
+    assert (positions["lock"].x, positions["lock"].y) == (30.0, -2.0)
+    assert positions["lock"].lateral_offset == 2.0
@@ -0,0 +1,104 @@
+import sqlite3
+
+import pytest
+
+yaramo_model = pytest.importorskip("yaramo.model")
+sqliteexporter = pytest.importorskip("planpro_importer.sqliteexporter")
+
+SQLiteExporter = sqliteexporter.SQLiteExporter
+
+
+def _node(uuid, x):
+    node = yaramo_model.Node(uuid=uuid)
+    node.geo_node = yaramo_model.DbrefGeoNode(x, 0.0, uuid=f"geo_{uuid}")
+    return node
+
+
+def _get_topology(name, node_uuids, edge_uuid, length=100.0):
+    """A topology with a single edge between two nodes."""
+    topology = yaramo_model.Topology(name=name)
+    node_a, node_b = (_node(uuid, x) for uuid, x in zip(node_uuids, (0.0, length)))
+    topology.add_node(node_a)
+    topology.add_node(node_b)
+    edge = yaramo_model.Edge(node_a, node_b, length=length, uuid=edge_uuid)
+    topology.add_edge(edge)
+    return topology
+
+
+def _query(database_file, sql):
+    connection = sqlite3.connect(database_file)
+    try:
+        return sorted(connection.execute(sql).fetchall())
+    finally:
+        connection.close()
+
+
+@pytest.fixture
+def database_file(tmp_path):
+    database_file = str(tmp_path / "network.sqlite")
+    # a: N1 - E1 - S, b: S - E2 - N2
+    with SQLiteExporter(database_file) as exporter:
+        exporter.export_topology(_get_topology("a", ("N1", "S"), "E1"))
+        exporter.export_topology(_get_topology("b", ("S", "N2"), "E2"))
+    return database_file
+
+
+def test_shared_elements_are_stored_once(database_file):
+    assert _query(database_file, "SELECT uuid, topology FROM nodes") == [("N1", "a"), ("N2", "b"), ("S", "a")]
+    assert _query(database_file, "SELECT topology, uuid FROM topology_elements WHERE element_table = 'nodes'") == [
+        ("a", "N1"), ("a", "S"), ("b", "N2"), ("b", "S"),
+    ]
+
+
+def test_delete_keeps_shared_elements(database_file):
+    with SQLiteExporter(database_file) as exporter:
+        exporter.delete_topology("a")
+
+    assert _query(database_file, "SELECT uuid, topology FROM nodes") == [("N2", "b"), ("S", "b")]
+    assert _query(database_file, "SELECT uuid FROM edges") == [("E2",)]
+    assert _query(database_file, "SELECT DISTINCT edge_uuid FROM edge_geometry") == [("E2",)]
+    assert _query(database_file, "SELECT name FROM topologies") == [("b",)]
+    assert _query(database_file, "SELECT DISTINCT topology FROM topology_elements") == [("b",)]
+
+
+def test_replace_topology(database_file):
+    with SQLiteExporter(database_file) as exporter:
+        exporter.export_topology(_get_topology("a", ("N3", "S"), "E3", length=50.0), replace=True)
+
+    assert _query(database_file, "SELECT uuid, topology FROM nodes") == [("N2", "b"), ("N3", "a"), ("S", "b")]
+    assert _query(database_file, "SELECT uuid, length FROM edges") == [("E2", 100.0), ("E3", 50.0)]
+    assert _query(database_file, "SELECT DISTINCT edge_uuid FROM edge_geometry") == [("E2",), ("E3",)]
+
+
+def test_record_failure(database_file):
+    with SQLiteExporter(database_file) as exporter:
+        exporter.record_failure("a", "ValueError: broken")
+
+    assert _query(database_file, "SELECT uuid FROM edges") == [("E2",)]
+    assert _query(database_file, "SELECT * FROM import_failures") == [("a", "ValueError: broken")]
+
+    with SQLiteExporter(database_file) as exporter:
+        exporter.export_topology(_get_topology("a", ("N1", "S"), "E1"))
+
+    assert _query(database_file, "SELECT * FROM import_failures") == []
+
+
+def test_export_twice_stores_rows_once(database_file):
+    with SQLiteExporter(database_file) as exporter:
+        exporter.export_topology(_get_topology("a", ("N1", "S"), "E1"))
+
+    assert _query(database_file, "SELECT COUNT(*) FROM nodes") == [(3,)]
+    assert _query(database_file, "SELECT COUNT(*) FROM edge_geometry") == [(4,)]
+    assert _query(database_file, "SELECT COUNT(*) FROM topology_elements") == [(6,)]
+
+
+def test_indexes_are_dropped_during_append(database_file):
+    index_query = "SELECT name FROM sqlite_master WHERE type = 'index' AND name LIKE 'idx_%' AND tbl_name != 'topology_elements'"
+    assert _query(database_file, index_query) == sorted((name,) for name in sqliteexporter.INDEXES)
+
+    exporter = SQLiteExporter(database_file)
+    exporter.export_topology(_get_topology("c", ("N3", "N4"), "E3"))
+    assert _query(database_file, index_query) == []
+
+    exporter.close()
+    assert _query(database_file, index_query) == sorted((name,) for name in sqliteexporter.INDEXES)
@@ -0,0 +1,103 @@
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("yaramo")
+validator = pytest.importorskip("planpro_importer.validator")
+PlanProVersion = pytest.importorskip("planpro_importer.planproversion").PlanProVersion
+
+ValidationErrorCode = validator.ValidationErrorCode
+
+
+def _value(value):
+    return SimpleNamespace(Wert=value)
+
+
+def _component(uuid, element_uuid, top_edge_uuid, distance, zungenpaar=True):
+    return SimpleNamespace(
+        Identitaet=_value(uuid),
+        ID_W_Kr_Gsp_Element=_value(element_uuid),
+        Zungenpaar=SimpleNamespace(Elektrischer_Antrieb_Anzahl=_value(1)) if zungenpaar else None,
+        Punkt_Objekt_TOP_Kante=[SimpleNamespace(ID_TOP_Kante=_value(top_edge_uuid), Abstand=_value(distance))],
+    )
+
+
+def _track(uuid, top_edge_uuid):
+    return SimpleNamespace(
+        Identitaet=_value(uuid), Bereich_Objekt_Teilbereich=[SimpleNamespace(ID_TOP_Kante=_value(top_edge_uuid))]
+    )
+
+
+def _get_root_object(components, elements, tracks):
+    container = SimpleNamespace(
+        TOP_Knoten=[
+            SimpleNamespace(Identitaet=_value("node_a"), ID_GEO_Knoten=_value("geo_a")),
+            SimpleNamespace(Identitaet=_value("node_b"), ID_GEO_Knoten=_value("geo_b")),
+        ],
+        GEO_Punkt=[SimpleNamespace(ID_GEO_Knoten=_value("geo_a")), SimpleNamespace(ID_GEO_Knoten=_value("geo_b"))],
+        GEO_Kante=[
+            SimpleNamespace(ID_GEO_Art=_value("edge"), ID_GEO_Knoten_A=_value("geo_a"), ID_GEO_Knoten_B=_value("geo_b"))
+        ],
+        TOP_Kante=[
+            SimpleNamespace(
+                Identitaet=_value("edge"),
+                ID_TOP_Knoten_A=_value("node_a"),
+                ID_TOP_Knoten_B=_value("node_b"),
+                TOP_Kante_Allg=SimpleNamespace(TOP_Laenge=_value("100")),
+            )
+        ],
+        W_Kr_Gsp_Komponente=components,
+        W_Kr_Gsp_Element=[SimpleNamespace(Identitaet=_value(uuid)) for uuid in elements],
+        Gleis_Art=tracks,
+        Signal=[],
+        Fstr_Fahrweg=[],
+    )
+    return SimpleNamespace(LST_Planung=None, LST_Zustand=SimpleNamespace(Container=container))
+
+
+def _get_codes(root_object, planpro_version=PlanProVersion.PlanPro110):
+    report = validator.PlanProValidator(root_object, planpro_version=planpro_version).validate()
+    return [(issue.code, issue.uuid) for issue in report.issues]
+
+
+def test_valid_points_and_tracks():
+    root_object = _get_root_object([_component("component", "element", "edge", "0")], ["element"], [_track("track", "edge")])
+
+    assert _get_codes(root_object) == []
+
+
+def test_point_element_without_component():
+    root_object = _get_root_object([], ["element"], [])
+
+    assert _get_codes(root_object) == [(ValidationErrorCode.MissingPointComponent, "element")]
+
+
+def test_drive_of_unresolved_point():
+    # The first component of the element is a lock within the edge, so the drive has no point
+    components = [
+        _component("lock", "element", "edge", "30", zungenpaar=False),
+        _component("component", "element", "edge", "0"),
+    ]
+    root_object = _get_root_object(components, ["element"], [])
+
+    assert _get_codes(root_object) == [(ValidationErrorCode.UnresolvedPointDrive, "component")]
+
+
+def test_unknown_point_and_track_edges():
+    root_object = _get_root_object(
+        [_component("component", "element", "unknown_edge", "0")], ["element"], [_track("track", "unknown_edge")]
+    )
+
+    assert _get_codes(root_object) == [
+        (ValidationErrorCode.UnknownPointEdge, "component"),
+        (ValidationErrorCode.UnresolvedPointDrive, "component"),
+        (ValidationErrorCode.UnknownTrackEdge, "track"),
+    ]
+
+
+def test_points_and_tracks_are_not_checked_for_planpro19():
+    root_object = _get_root_object(
+        [_component("component", "element", "unknown_edge", "0")], ["element"], [_track("track", "unknown_edge")]
+    )
+
+    assert _get_codes(root_object, PlanProVersion.PlanPro19) == []